@@ -0,0 +1,157 @@
+"""학생 활동 이벤트 기록
+
+단계 진입/완료, 퀴즈 응답, 제출 같은 이벤트를 덮어쓰지 않고 계속 추가합니다.
+- 최근 이벤트는 크기가 제한된 메모리 링 버퍼에 보관
+- 이벤트는 일정 개수씩 묶어 압축된 세그먼트 파일(JSON Lines + gzip)로 저장
+- 분 단위 이벤트 수를 미리 집계해 두어 대시보드가 원본 이벤트를 다시 훑지 않음
+- 분 단위 집계는 보관 기간(keep_minutes)이 지나면 버리고, 재시작 시에도 그 기간의 세그먼트만 읽음
+"""
+import atexit
+import bisect
+import gzip
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+# 이벤트 종류
+STAGE_ENTERED = 'stage_entered'
+STAGE_COMPLETED = 'stage_completed'
+QUIZ_ANSWERED = 'quiz_answered'
+SUBMITTED = 'submitted'
+
+# 학생별 단계 첫 완료 (다시 완료해도 한 번만 집계하는 내부 집계 키)
+_FIRST_COMPLETED = 'first_completed'
+
+
+class ActivityLog:
+    """추가 전용 활동 로그
+
+    - log_dir: 세그먼트 파일을 저장할 폴더
+    - buffer_size: 메모리에 보관하는 최근 이벤트 수
+    - segment_size: 세그먼트 하나에 담는 이벤트 수
+    - flush_interval: 이벤트가 적어도 이 시간(초)이 지나면 세그먼트로 저장
+    - keep_minutes: 분 단위 집계를 보관하는 기간(분)
+    """
+
+    def __init__(self, log_dir, buffer_size=5000, segment_size=256, flush_interval=10, keep_minutes=24 * 60):
+        self.log_dir = log_dir
+        self.segment_size = segment_size
+        self.flush_interval = flush_interval
+        self.keep_seconds = keep_minutes * 60
+        self.recent = deque(maxlen=buffer_size)
+        # {분 시작 시각: Counter({(이벤트 종류, 단계): 개수})}, 분 시작 시각은 _minutes에 정렬해 보관
+        self.minute_counts = defaultdict(Counter)
+        self._minutes = []
+        # {(학생, 단계): 처음 완료한 분} - 같은 학생의 반복 완료를 한 번만 세기 위함
+        self._completed_at = {}
+        self._pending = []
+        self._last_flush = time.time()
+        self._segment_seq = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(log_dir, exist_ok=True)
+        self._load_segments()
+        atexit.register(self.flush)
+
+    def append(self, event_type, student_id, stage=None, **fields):
+        """이벤트 추가 (timestamp는 유닉스 시간 초)"""
+        event = {'ts': time.time(), 'type': event_type, 'student_id': student_id, 'stage': stage}
+        event.update(fields)
+
+        with self._lock:
+            self.recent.append(event)
+            self._count(event)
+            self._pending.append(event)
+            if (len(self._pending) >= self.segment_size
+                    or event['ts'] - self._last_flush >= self.flush_interval):
+                self._write_segment()
+        return event
+
+    def flush(self):
+        """아직 저장되지 않은 이벤트를 세그먼트로 저장"""
+        with self._lock:
+            self._write_segment()
+
+    def timeline(self, since=None):
+        """분 단위 집계 → [(분 시작 시각, 이벤트 종류, 단계, 개수), ...]"""
+        with self._lock:
+            rows = [
+                (minute, event_type, stage, count)
+                for minute in self._minutes_since(since)
+                for (event_type, stage), count in self.minute_counts[minute].items()
+                if event_type != _FIRST_COMPLETED
+            ]
+        return rows
+
+    def completions(self, since=None):
+        """분 단위로 단계를 처음 완료한 학생 수 → [(분 시작 시각, 단계, 학생 수), ...]"""
+        with self._lock:
+            rows = [
+                (minute, stage, count)
+                for minute in self._minutes_since(since)
+                for (event_type, stage), count in self.minute_counts[minute].items()
+                if event_type == _FIRST_COMPLETED
+            ]
+        return rows
+
+    def _minutes_since(self, since):
+        start = 0 if since is None else bisect.bisect_left(self._minutes, since)
+        return self._minutes[start:]
+
+    def _count(self, event):
+        minute = int(event['ts'] // 60) * 60
+        if minute not in self.minute_counts:
+            bisect.insort(self._minutes, minute)
+            self._prune(minute)
+        counter = self.minute_counts[minute]
+        counter[(event['type'], event['stage'])] += 1
+
+        if event['type'] == STAGE_COMPLETED:
+            key = (event['student_id'], event['stage'])
+            if key not in self._completed_at:
+                self._completed_at[key] = minute
+                counter[(_FIRST_COMPLETED, event['stage'])] += 1
+
+    def _prune(self, latest_minute):
+        """보관 기간이 지난 분 단위 집계 삭제 (새로운 분이 시작될 때만 실행)"""
+        cutoff = latest_minute - self.keep_seconds
+        expired = bisect.bisect_left(self._minutes, cutoff)
+        if not expired:
+            return
+        for minute in self._minutes[:expired]:
+            del self.minute_counts[minute]
+        del self._minutes[:expired]
+        self._completed_at = {key: minute for key, minute in self._completed_at.items() if minute >= cutoff}
+
+    def _write_segment(self):
+        self._last_flush = time.time()
+        if not self._pending:
+            return
+
+        self._segment_seq += 1
+        name = f"segment_{int(self._pending[0]['ts'] * 1000)}_{self._segment_seq:06d}.jsonl.gz"
+        with gzip.open(os.path.join(self.log_dir, name), 'wt', encoding='utf-8') as f:
+            for event in self._pending:
+                f.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._pending = []
+
+    def _load_segments(self):
+        """서버 재시작 시 보관 기간 안의 세그먼트로 분 단위 집계와 최근 이벤트 복원"""
+        segments = sorted(
+            (int(name.split('_')[1]) / 1000, name)
+            for name in os.listdir(self.log_dir) if name.startswith('segment_')
+        )
+        self._segment_seq = len(segments)
+
+        # 파일 이름의 첫 이벤트 시각으로 보관 기간 안의 이벤트가 들어 있을 수 있는 세그먼트부터 읽음
+        cutoff = time.time() - self.keep_seconds
+        first = max(0, bisect.bisect_left(segments, (cutoff,)) - 1)
+        for _, name in segments[first:]:
+            with gzip.open(os.path.join(self.log_dir, name), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    event = json.loads(line)
+                    if event['ts'] >= cutoff:
+                        self.recent.append(event)
+                        self._count(event)
@@ -0,0 +1,69 @@
+"""이상 거래 탐지 실습용 스트림 처리
+
+모의 거래를 작은 묶음(micro-batch)으로 만들어 내는 제너레이터와,
+KMeans 중심까지의 거리로 묶음 전체를 한 번에 채점하는 함수,
+최근 N건만 보관하는 고정 크기 링 버퍼를 제공합니다.
+"""
+import numpy as np
+
+from class_datasets import CUSTOMER_GROUPS
+
+
+def transaction_stream(seed, batch_size=100, anomaly_rate=0.02):
+    """(거래 특성 [나이, 연소득], 실제 이상 여부) 묶음을 끝없이 생성
+
+    anomaly_rate는 제너레이터에 send로 바꿀 수 있습니다.
+    """
+    rng = np.random.default_rng(seed)
+    while True:
+        groups = CUSTOMER_GROUPS[rng.integers(0, len(CUSTOMER_GROUPS), batch_size)]
+        X = np.column_stack([
+            rng.normal(groups[:, 0], groups[:, 1]),
+            rng.normal(groups[:, 2], groups[:, 3])
+        ])
+
+        # 평소 고객 패턴에서 벗어난 거래 섞기
+        is_anomaly = rng.random(batch_size) < anomaly_rate
+        n_anomaly = int(is_anomaly.sum())
+        X[is_anomaly] = np.column_stack([
+            rng.uniform(15, 80, n_anomaly),
+            rng.choice([-1, 1], n_anomaly) * rng.uniform(4000, 8000, n_anomaly) + 6000
+        ])
+
+        new_rate = yield X, is_anomaly
+        if new_rate is not None:
+            anomaly_rate = new_rate
+
+
+def centroid_distance(X, scaler, centroids):
+    """표준화한 공간에서 가장 가까운 군집 중심까지의 거리 (묶음 단위 벡터 연산)"""
+    X_scaled = scaler.transform(X)
+    distances = np.linalg.norm(X_scaled[:, None, :] - centroids[None, :, :], axis=2)
+    return distances.min(axis=1)
+
+
+class RollingWindow:
+    """최근 size건만 보관하는 고정 크기 링 버퍼"""
+
+    def __init__(self, size, n_features):
+        self.size = size
+        self.X = np.zeros((size, n_features))
+        self.scores = np.zeros(size)
+        self.flags = np.zeros(size, dtype=bool)
+        self.count = 0
+
+    def append(self, X, scores, flags):
+        # 묶음이 버퍼보다 크면 마지막 size건만 기록
+        skip = max(0, len(X) - self.size)
+        idx = (self.count + np.arange(skip, len(X))) % self.size
+        self.X[idx] = X[skip:]
+        self.scores[idx] = scores[skip:]
+        self.flags[idx] = flags[skip:]
+        self.count += len(X)
+
+    def view(self):
+        """오래된 순서로 정렬된 (순번, 특성, 점수, 이상 여부)"""
+        n = min(self.count, self.size)
+        order = (self.count - n + np.arange(n)) % self.size
+        seq = np.arange(self.count - n, self.count)
+        return seq, self.X[order], self.scores[order], self.flags[order]
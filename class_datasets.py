@@ -0,0 +1,112 @@
+"""학생별 실습 데이터셋
+
+학번으로 정한 시드마다 서로 다른 데이터를 만들되, 반 전체를 (학생 × 샘플 × 변수)
+3차원 배열로 한 번에 생성합니다. 난수는 (시드, 샘플 번호, 변수 번호)를 해시하여 만들기 때문에
+어떤 학생들과 함께 생성하더라도 같은 학번이면 항상 같은 데이터가 나옵니다.
+"""
+import threading
+import zlib
+
+import numpy as np
+
+CLASSIFICATION_SAMPLES = 100
+CUSTOMER_GROUP_SIZE = 50
+
+# 고객 그룹별 (평균 나이, 나이 표준편차, 평균 소득, 소득 표준편차)
+CUSTOMER_GROUPS = np.array([
+    [28, 5, 6000, 1000],
+    [45, 8, 4000, 800],
+    [60, 7, 7000, 1200]
+], dtype=float)
+
+
+def student_seed(student_id):
+    return zlib.crc32(str(student_id).encode('utf-8'))
+
+
+def _uniform(seeds, n_samples, n_vars):
+    """(학생, 샘플, 변수) 모양의 (0, 1] 균등 난수 (splitmix64 해시)"""
+    counter = np.arange(n_samples * n_vars, dtype=np.uint64).reshape(1, n_samples, n_vars)
+    z = (np.asarray(seeds, dtype=np.uint64).reshape(-1, 1, 1) << np.uint64(32)) ^ counter
+    z = z + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return ((z >> np.uint64(11)).astype(np.float64) + 1) / 2.0 ** 53
+
+
+def _normal_pair(u1, u2):
+    """Box-Muller 변환으로 표준정규 난수 두 개"""
+    r = np.sqrt(-2 * np.log(u1))
+    return r * np.cos(2 * np.pi * u2), r * np.sin(2 * np.pi * u2)
+
+
+def generate_classification_batch(seeds, n_samples=CLASSIFICATION_SAMPLES):
+    """시험 합격 데이터 (학생, 샘플, [공부시간, 수면시간, 합격여부])"""
+    u = _uniform(seeds, n_samples, 3)
+    z_study, z_sleep = _normal_pair(u[..., 0], u[..., 1])
+
+    study_time = 5 + 2 * z_study
+    sleep_time = 7 + 1 * z_sleep
+    pass_prob = (study_time * 0.3 + sleep_time * 0.1 - 2) / 5
+    pass_exam = (u[..., 2] < pass_prob).astype(float)
+
+    return np.stack([np.clip(study_time, 0, 12), np.clip(sleep_time, 4, 10), pass_exam], axis=-1)
+
+
+def generate_customer_batch(seeds, group_size=CUSTOMER_GROUP_SIZE):
+    """고객 데이터 (학생, 샘플, [나이, 연소득])"""
+    n_groups = len(CUSTOMER_GROUPS)
+    u = _uniform(seeds, n_groups * group_size, 2)
+    z_age, z_income = _normal_pair(u[..., 0], u[..., 1])
+
+    groups = np.repeat(CUSTOMER_GROUPS, group_size, axis=0)  # (샘플, 4)
+    ages = groups[:, 0] + groups[:, 1] * z_age
+    incomes = groups[:, 2] + groups[:, 3] * z_income
+
+    return np.stack([np.clip(ages, 20, 70).astype(int), np.clip(incomes, 2000, 10000).astype(int)], axis=-1)
+
+
+class ClassDatasets:
+    """학번별 데이터 배열 캐시 (없는 학생들은 한 번의 배치로 생성)"""
+
+    def __init__(self):
+        self.classification = {}
+        self.customers = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, student_ids):
+        """아직 생성되지 않은 학생들의 데이터를 한 번에 생성"""
+        with self._lock:
+            missing = [student_id for student_id in dict.fromkeys(student_ids)
+                       if student_id not in self.classification]
+            if not missing:
+                return 0
+
+            seeds = [student_seed(student_id) for student_id in missing]
+            classification = generate_classification_batch(seeds)
+            customers = generate_customer_batch(seeds)
+            for i, student_id in enumerate(missing):
+                self.classification[student_id] = classification[i]
+                self.customers[student_id] = customers[i]
+            return len(missing)
+
+    def get(self, student_id, roster=tuple):
+        """학생 데이터 (classification, customers) - 없으면 roster()의 다른 학생들과 함께 생성
+
+        roster는 학번 목록을 돌려주는 함수로, 데이터를 새로 만들어야 할 때만 호출합니다.
+        """
+        while True:
+            with self._lock:
+                if student_id in self.classification:
+                    return self.classification[student_id], self.customers[student_id]
+            self.prepare([student_id, *roster()])
+
+    def remove(self, student_id):
+        """메모리에서 내보낸 학생의 데이터 삭제 (다시 접속하면 같은 학번이므로 같은 데이터가 생성됨)"""
+        with self._lock:
+            self.classification.pop(student_id, None)
+            self.customers.pop(student_id, None)
+
+    def __len__(self):
+        return len(self.classification)
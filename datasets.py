@@ -0,0 +1,196 @@
+"""교사 업로드 실습 데이터셋
+
+CSV를 일정 행씩 나누어 읽으면서 열 이름과 자료형을 검사하고,
+검사를 통과한 데이터는 레코드 배치 하나짜리 Arrow IPC 파일로 한 번만 저장합니다.
+이 파일을 메모리 매핑으로 열면 숫자 열은 복사 없이 DataFrame이 되어 운영체제 페이지 캐시를 공유합니다.
+(문자열 열은 pandas 객체로 한 번 변환됩니다.)
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+MAX_ROWS = 200_000
+CHUNK_ROWS = 10_000
+
+# 실습별 필수 열: {열 이름: 자료형}
+#   'float' / 'int': 숫자 (변환 불가 값은 오류)
+#   'label': 합격/불합격 (1/0, True/False 허용)
+#   'str': 문자열 (없으면 자동 생성)
+LAB_SCHEMAS = {
+    'supervised': {
+        '공부시간': 'float',
+        '수면시간': 'float',
+        '시험결과': 'label'
+    },
+    'unsupervised': {
+        '나이': 'int',
+        '연소득': 'int',
+        '고객ID': 'str'
+    }
+}
+
+LABEL_VALUES = {
+    '합격': '합격', '불합격': '불합격',
+    '1': '합격', '0': '불합격',
+    'true': '합격', 'false': '불합격'
+}
+
+
+# active.json 읽기-수정-쓰기를 한 번에 하나씩 처리
+_active_lock = threading.Lock()
+
+
+class DatasetValidationError(Exception):
+    """업로드한 CSV가 실습 형식에 맞지 않을 때 발생"""
+
+
+def _convert_chunk(chunk, schema, row_offset):
+    """청크 하나를 실습 스키마에 맞게 변환 (잘못된 값이 있으면 행 번호와 함께 오류)"""
+    converted = {}
+    for column, kind in schema.items():
+        if column not in chunk.columns:
+            if kind == 'str':
+                converted[column] = [f'C{i:05d}' for i in range(row_offset + 1, row_offset + len(chunk) + 1)]
+                continue
+            raise DatasetValidationError(f"필수 열 '{column}'이(가) 없습니다. (필요한 열: {', '.join(schema)})")
+
+        values = chunk[column]
+        if kind in ('float', 'int'):
+            numbers = pd.to_numeric(values, errors='coerce').astype('float64').to_numpy()
+            bad = ~np.isfinite(numbers)
+            if bad.any():
+                row = row_offset + int(bad.argmax()) + 2  # 머리글 행 포함
+                raise DatasetValidationError(f"{row}행 '{column}' 값이 숫자가 아닙니다: {str(values[bad].iloc[0])!r}")
+            if kind == 'int':
+                # 소수나 int64 범위를 넘는 값은 잘리거나 넘치지 않도록 오류 처리
+                bad = (numbers != np.round(numbers)) | (np.abs(numbers) >= 2.0 ** 63)
+                if bad.any():
+                    row = row_offset + int(bad.argmax()) + 2
+                    raise DatasetValidationError(f"{row}행 '{column}' 값은 정수여야 합니다: {str(values[bad].iloc[0])!r}")
+            converted[column] = numbers.astype('float64' if kind == 'float' else 'int64')
+        elif kind == 'label':
+            labels = values.astype(str).str.strip().str.lower().map(LABEL_VALUES)
+            bad = labels.isna()
+            if bad.any():
+                row = row_offset + int(bad.to_numpy().argmax()) + 2
+                raise DatasetValidationError(f"{row}행 '{column}' 값은 합격/불합격이어야 합니다: {str(values[bad].iloc[0])!r}")
+            converted[column] = labels
+        else:
+            converted[column] = values.astype(str)
+
+    return pd.DataFrame(converted)
+
+
+def import_csv(uploaded_file, lab, dataset_dir):
+    """CSV를 검사하여 Arrow 파일로 저장하고 (파일 경로, 행 수) 반환"""
+    schema = LAB_SCHEMAS[lab]
+
+    size = getattr(uploaded_file, 'size', None)
+    if size is not None and size > MAX_UPLOAD_BYTES:
+        raise DatasetValidationError(f"파일이 너무 큽니다. (최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB)")
+
+    os.makedirs(dataset_dir, exist_ok=True)
+    # 같은 실습에 동시에 올려도 서로의 파일을 덮어쓰지 않도록 업로드마다 다른 임시 파일 사용
+    tmp_path = os.path.join(dataset_dir, f'.upload_{lab}_{uuid.uuid4().hex}.arrow.tmp')
+    digest = hashlib.sha256()
+    arrow_schema = None
+    writer = None
+    n_rows = 0
+
+    try:
+        for chunk in pd.read_csv(uploaded_file, chunksize=CHUNK_ROWS, skipinitialspace=True, encoding='utf-8-sig'):
+            n_rows += len(chunk)
+            if n_rows > MAX_ROWS:
+                raise DatasetValidationError(f"행이 너무 많습니다. (최대 {MAX_ROWS:,}행)")
+
+            chunk.columns = [str(column).strip() for column in chunk.columns]
+            converted = _convert_chunk(chunk, schema, n_rows - len(chunk))
+            digest.update(pd.util.hash_pandas_object(converted, index=False).to_numpy().tobytes())
+
+            table = pa.Table.from_pandas(converted, preserve_index=False)
+            if writer is None:
+                arrow_schema = table.schema
+                writer = pa.ipc.new_file(tmp_path, arrow_schema)
+            writer.write_table(table.cast(arrow_schema))
+
+        if n_rows == 0:
+            raise DatasetValidationError("데이터 행이 없습니다.")
+        writer.close()
+        writer = None
+
+        # 같은 내용이면 같은 파일 이름이 되도록 내용 해시로 저장
+        path = os.path.join(dataset_dir, f'{lab}_{digest.hexdigest()[:16]}.arrow')
+        _write_single_batch(tmp_path, path)
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise DatasetValidationError(f"CSV 파일을 읽을 수 없습니다: {e}") from e
+    except pd.errors.EmptyDataError as e:
+        raise DatasetValidationError("빈 파일입니다.") from e
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return path, n_rows
+
+
+def _write_single_batch(tmp_path, path):
+    """청크별로 저장한 파일을 레코드 배치 하나로 합쳐 저장 (열마다 연속된 버퍼가 되어야 복사 없이 읽힘)"""
+    with pa.memory_map(tmp_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all().combine_chunks()
+    single_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with pa.ipc.new_file(single_path, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(single_path, path)
+
+
+def load_arrow_dataset(path):
+    """메모리 매핑으로 Arrow 파일 열기 (파싱 없이 운영체제 페이지 캐시를 공유)"""
+    source = pa.memory_map(path, 'r')
+    return pa.ipc.open_file(source).read_all()
+
+
+def arrow_to_pandas(table):
+    """숫자 열은 매핑된 버퍼를 그대로 쓰는 (읽기 전용) DataFrame으로 변환"""
+    return table.to_pandas(split_blocks=True)
+
+
+def read_active_datasets(dataset_dir):
+    """실습별 현재 사용 중인 업로드 데이터셋 {실습: {'path', 'rows', 'name'}}"""
+    try:
+        with open(os.path.join(dataset_dir, 'active.json'), encoding='utf-8') as f:
+            active = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return {lab: info for lab, info in active.items() if os.path.exists(info['path'])}
+
+
+def set_active_dataset(dataset_dir, lab, info):
+    """실습에 사용할 데이터셋 지정 (info가 None이면 기본 데이터로 되돌림)
+
+    더 이상 어느 실습에서도 쓰지 않는 이전 파일은 삭제합니다.
+    """
+    with _active_lock:
+        active = read_active_datasets(dataset_dir)
+        previous = active.pop(lab, None)
+        if info is not None:
+            active[lab] = info
+
+        os.makedirs(dataset_dir, exist_ok=True)
+        tmp_path = os.path.join(dataset_dir, f'active.json.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(active, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(dataset_dir, 'active.json'))
+
+        if previous is not None and previous['path'] not in {other['path'] for other in active.values()}:
+            try:
+                os.remove(previous['path'])
+            except OSError:
+                pass  # 이미 지워졌거나 (Windows에서) 다른 세션이 매핑 중인 파일
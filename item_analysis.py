@@ -0,0 +1,95 @@
+"""형성평가 문항 분석
+
+퀴즈가 제출될 때마다 (총점, 문항, 선택지)별 선택 횟수를 누적합니다.
+정답률, 오답 선택 비율, 변별도(상위/하위 집단 정답률 차이)는 이 누적값만으로 계산하므로
+화면을 그리는 비용은 학생 수와 상관없이 문항 수 × 선택지 수에 비례합니다.
+"""
+import threading
+
+import numpy as np
+
+# 변별도 계산에 쓰는 상위/하위 집단 비율
+GROUP_RATIO = 0.27
+
+
+class ItemStats:
+    """문항별 선택 횟수 누적 통계"""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.n_questions = len(questions)
+        self.n_options = max(len(question['options']) for question in questions)
+        self.correct = np.array([question['correct'] for question in questions])
+        # [총점(맞힌 개수), 문항, 선택지] 별 선택 횟수
+        self.counts = np.zeros((self.n_questions + 1, self.n_questions, self.n_options), dtype=np.int64)
+        self.score_hist = np.zeros(self.n_questions + 1, dtype=np.int64)
+        self._submissions = {}
+        self._lock = threading.Lock()
+
+    def record(self, student_id, choices):
+        """학생의 선택지 번호 목록 반영 (다시 제출하면 이전 제출을 대체)"""
+        choices = np.asarray(choices)
+        score = int((choices == self.correct).sum())
+
+        with self._lock:
+            self._apply(student_id, -1)
+            self._submissions[student_id] = (choices, score)
+            self._apply(student_id, 1)
+
+    def remove(self, student_id):
+        with self._lock:
+            self._apply(student_id, -1)
+            self._submissions.pop(student_id, None)
+
+    def _apply(self, student_id, sign):
+        if student_id not in self._submissions:
+            return
+        choices, score = self._submissions[student_id]
+        self.counts[score, np.arange(self.n_questions), choices] += sign
+        self.score_hist[score] += sign
+
+    def _group_weights(self, from_top):
+        """총점 순으로 GROUP_RATIO만큼 학생을 고를 때 점수 구간별 포함 비율 (경계 점수는 일부만 포함)"""
+        target = self.score_hist.sum() * GROUP_RATIO
+        weights = np.zeros(len(self.score_hist))
+        levels = range(len(self.score_hist) - 1, -1, -1) if from_top else range(len(self.score_hist))
+        for level in levels:
+            if target <= 0:
+                break
+            count = self.score_hist[level]
+            if count:
+                weights[level] = min(1.0, target / count)
+                target -= count
+        return weights
+
+    def summary(self):
+        """문항별 결과 [{'question', 'n', 'correct_rate', 'discrimination', 'option_rates'}, ...]"""
+        with self._lock:
+            totals = self.counts.sum(axis=0)  # [문항, 선택지]
+            n = int(self.score_hist.sum())
+            upper = self._group_weights(from_top=True)
+            lower = self._group_weights(from_top=False)
+            upper_n = (upper * self.score_hist).sum()
+            lower_n = (lower * self.score_hist).sum()
+            # [문항, 선택지] 별 상위/하위 집단 선택 횟수
+            upper_counts = np.tensordot(upper, self.counts, axes=1)
+            lower_counts = np.tensordot(lower, self.counts, axes=1)
+
+        results = []
+        for q, question in enumerate(self.questions):
+            correct = question['correct']
+            option_rates = totals[q, :len(question['options'])] / n if n else np.zeros(len(question['options']))
+            discrimination = None
+            if upper_n and lower_n:
+                discrimination = upper_counts[q, correct] / upper_n - lower_counts[q, correct] / lower_n
+            results.append({
+                'question': question,
+                'n': n,
+                'correct_rate': option_rates[correct] if n else None,
+                'discrimination': discrimination,
+                'option_rates': option_rates
+            })
+        return results
+
+    def __len__(self):
+        return len(self._submissions)
@@ -0,0 +1,52 @@
+"""수업지도안 HTML 빌드
+
+pages/학습지도안.html(+ style.css, script.js)을 수업지도안의 유일한 원본으로 사용합니다.
+CSS와 JavaScript를 한 파일에 인라인으로 합쳐 두면 Streamlit 화면에서는
+컴포넌트 하나로 표시할 수 있어, 매 rerun마다 수십 개의 요소를 만들지 않아도 됩니다.
+"""
+import os
+import re
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+SOURCE_FILES = ('학습지도안.html', 'style.css', 'script.js')
+
+SCRIPT_TAG = re.compile(r'<script[^>]*>\s*</script>', re.IGNORECASE)
+LINK_TAG = re.compile(r'<link[^>]*rel="stylesheet"[^>]*>', re.IGNORECASE)
+BODY = re.compile(r'<body[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+PARTIAL = re.compile(r'<!-- partial:[^>]*-->(.*)<!-- partial -->', re.DOTALL)
+
+
+def source_mtimes(pages_dir=PAGES_DIR):
+    """원본 파일 수정 시각 (캐시 키로 사용하여 원본이 바뀌면 다시 빌드)"""
+    return tuple(os.path.getmtime(os.path.join(pages_dir, name)) for name in SOURCE_FILES)
+
+
+def _read(pages_dir, name):
+    with open(os.path.join(pages_dir, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def build_lesson_plan_html(pages_dir=PAGES_DIR):
+    """스타일과 스크립트를 인라인으로 포함한 단일 HTML 문서"""
+    html = _read(pages_dir, '학습지도안.html')
+    css = _read(pages_dir, 'style.css')
+    js = _read(pages_dir, 'script.js')
+
+    # CodePen 내보내기 형식이면 안쪽 문서만 사용
+    partial = PARTIAL.search(html)
+    if partial:
+        html = partial.group(1)
+
+    body = BODY.search(html)
+    content = body.group(1) if body else html
+    content = LINK_TAG.sub('', SCRIPT_TAG.sub('', content))
+
+    # </script> 문자열이 스크립트 블록을 일찍 닫지 않도록 처리
+    js = js.replace('</script', '<\\/script')
+
+    return (
+        '<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="UTF-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        f'<style>\n{css}\n</style>\n</head>\n<body>\n{content}\n'
+        f'<script>\n{js}\n</script>\n</body>\n</html>\n'
+    )
@@ -1,16 +1,34 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score
+from joblib import Parallel, delayed
 from datetime import datetime
+import os
 import time
+from training_jobs import (TrainingJobService, TrainingQueueFull, QUEUED, RUNNING, DONE, FAILED,
+                           cross_validate_config, compute_learning_curve)
+from activity_log import ActivityLog, STAGE_ENTERED, STAGE_COMPLETED, QUIZ_ANSWERED, SUBMITTED
+from reflection_index import ReflectionIndex
+from student_store import StudentStore
+from model_store import load_model, model_key, model_path, save_model
+from item_analysis import ItemStats
+from lesson_plan import build_lesson_plan_html, source_mtimes
+from class_datasets import ClassDatasets, student_seed
+from anomaly_stream import transaction_stream, centroid_distance, RollingWindow
+from student_table import StudentTable, SORT_COLUMNS
+from datasets import (LAB_SCHEMAS, DatasetValidationError, import_csv, load_arrow_dataset,
+                      arrow_to_pandas, read_active_datasets, set_active_dataset)
+
+# 서버 로컬 데이터 폴더 (활동 로그 등)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DATASET_DIR = os.path.join(DATA_DIR, 'datasets')
+MODEL_DIR = os.path.join(DATA_DIR, 'models')
 
 # 페이지 설정
 st.set_page_config(
@@ -19,9 +37,77 @@ st.set_page_config(
     layout="wide"
 )
 
-# 전역 데이터 저장소 (실제 환경에서는 데이터베이스 사용)
-if 'all_students_data' not in st.session_state:
-    st.session_state.all_students_data = []
+# 학생 기록 보관 설정: 마지막 활동 후 6시간이 지나면 메모리에서 내보내고, 보관 파일은 180일 유지
+STUDENT_IDLE_TTL = 6 * 60 * 60
+STUDENT_RETENTION_DAYS = 180
+
+# 모델 학습 작업 서비스 (모든 세션이 하나의 프로세스 풀을 공유)
+@st.cache_resource
+def get_training_service():
+    return TrainingJobService(max_workers=2, max_queue=16, stale_after=120)
+
+# 학생 활동 로그 (모든 세션이 공유)
+@st.cache_resource
+def get_activity_log():
+    return ActivityLog(os.path.join(DATA_DIR, 'activity_log'))
+
+def log_activity(event_type, stage=None, **fields):
+    if st.session_state.student_info:
+        get_activity_log().append(event_type, st.session_state.student_info['id'], stage, **fields)
+
+# 성찰 내용 키워드 인덱스 (성찰이 저장될 때마다 해당 학생 문서만 갱신)
+@st.cache_resource
+def get_reflection_index():
+    return ReflectionIndex()
+
+# 형성평가 문항 분석 (퀴즈 제출 시 누적)
+@st.cache_resource
+def get_item_stats():
+    return ItemStats(QUIZ_QUESTIONS)
+
+# 전역 학생 데이터 저장소 (모든 세션이 공유, 실제 환경에서는 데이터베이스 사용)
+@st.cache_resource
+def get_student_store():
+    store = StudentStore(os.path.join(DATA_DIR, 'student_archive'),
+                         idle_ttl=STUDENT_IDLE_TTL, retention_days=STUDENT_RETENTION_DAYS)
+    reflection_index = get_reflection_index()
+    item_stats = get_item_stats()
+    class_datasets = get_class_datasets()
+    store.on_evict.append(lambda record: reflection_index.update(record['id'], ''))
+    store.on_evict.append(lambda record: item_stats.remove(record['id']))
+    store.on_evict.append(lambda record: class_datasets.remove(record['id']))
+    store.start_sweeper()
+    return store
+
+def format_timestamp(ts):
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+# 저장된 모델은 처음 필요할 때 메모리 매핑으로 열고, 프로세스 안에서는 한 번만 불러옴
+@st.cache_resource(max_entries=32)
+def load_saved_model(kind, key):
+    return load_model(MODEL_DIR, kind, key)
+
+def get_saved_model(kind, key):
+    if not os.path.exists(model_path(MODEL_DIR, kind, key)):
+        return None
+    return load_saved_model(kind, key)
+
+def fit_clustering(X, n_clusters):
+    """고객 데이터 클러스터링 (같은 데이터/그룹 수로 저장된 결과가 있으면 재사용)"""
+    key = model_key([X], {'n_clusters': n_clusters, 'random_state': 42})
+    result = get_saved_model('clustering', key)
+    
+    if result is None:
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+        
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+        clusters = kmeans.fit_predict(X_scaled)
+        
+        result = {'scaler': scaler, 'kmeans': kmeans, 'labels': clusters}
+        save_model(MODEL_DIR, 'clustering', key, result)
+    
+    return result
 
 # 세션 상태 초기화
 def init_session_state():
@@ -45,36 +131,53 @@ def init_session_state():
 # 학생 데이터 저장 함수
 def save_student_data():
     if st.session_state.student_info:
-        # 퀴즈 점수 계산
-        quiz_score = 0
-        if st.session_state.quiz_answers:
-            correct_count = sum(1 for ans in st.session_state.quiz_answers.values() if ans['correct'])
-            quiz_score = (correct_count / len(QUIZ_QUESTIONS)) * 100
-        
-        student_data = {
-            'name': st.session_state.student_info['name'],
-            'id': st.session_state.student_info['id'],
-            'progress': st.session_state.progress.copy(),
-            'quiz_answers': st.session_state.quiz_answers.copy(),
-            'last_updated': datetime.now().strftime('%H:%M:%S'),
-            'quiz_score': quiz_score,
-            'reflection': getattr(st.session_state, 'current_reflection', '')
-        }
-        
-        # 기존 학생 데이터 업데이트 또는 새로 추가
-        existing_index = None
-        for i, data in enumerate(st.session_state.all_students_data):
-            if data['id'] == student_data['id']:
-                existing_index = i
-                break
-        
-        if existing_index is not None:
-            st.session_state.all_students_data[existing_index] = student_data
-        else:
-            st.session_state.all_students_data.append(student_data)
-        
-        # 강제로 상태 저장
-        st.session_state.all_students_data = st.session_state.all_students_data
+        student_data = build_student_record(
+            st.session_state.student_info,
+            st.session_state.progress,
+            st.session_state.quiz_answers,
+            getattr(st.session_state, 'current_reflection', '')
+        )
+        store_student_data(student_data)
+
+def calculate_quiz_score(quiz_answers):
+    """퀴즈 점수 (100점 만점, 답한 문항이 없으면 0점)"""
+    if not quiz_answers:
+        return 0
+    correct_count = sum(1 for ans in quiz_answers.values() if ans['correct'])
+    return (correct_count / len(QUIZ_QUESTIONS)) * 100
+
+def make_quiz_answer(question, answer):
+    """퀴즈 응답 기록 {'answer', 'correct'}"""
+    return {
+        'answer': answer,
+        'correct': question['options'].index(answer) == question['correct']
+    }
+
+def build_student_record(student_info, progress, quiz_answers, reflection):
+    """저장소에 넣을 학생 기록"""
+    return {
+        'name': student_info['name'],
+        'id': student_info['id'],
+        'progress': progress.copy(),
+        'quiz_answers': quiz_answers.copy(),
+        'quiz_score': calculate_quiz_score(quiz_answers),
+        'reflection': reflection
+    }
+
+def record_quiz_submission(student_id, quiz_answers):
+    """제출한 선택지를 문항 분석에 반영 (학생 기록을 저장한 뒤에 호출)"""
+    get_item_stats().record(student_id, [
+        question['options'].index(quiz_answers[question['id']]['answer'])
+        for question in QUIZ_QUESTIONS
+    ])
+
+def store_student_data(student_data):
+    """학생 기록 저장 경로 (세션 상태와 무관하므로 replay_traffic.py 부하 테스트에서도 사용)"""
+    # 기존 학생 데이터 업데이트 또는 새로 추가 (저장소에 먼저 넣어야 동시에 내보내기가 일어나도 인덱스가 지워지지 않음)
+    record = get_student_store().upsert(student_data)
+    if student_data['reflection']:
+        get_reflection_index().update(student_data['id'], student_data['reflection'])
+    return record
 
 # 퀴즈 문제
 QUIZ_QUESTIONS = [
@@ -156,200 +259,123 @@ def generate_customer_data():
     
     return df
 
+def generate_score_data(rng, n_samples=20):
+    """회귀 실습용 공부시간-시험점수 데이터 (rng는 세션별 난수 생성기)"""
+    study_time = rng.uniform(0, 12, n_samples)
+    score = np.clip(40 + study_time * 5 + rng.normal(0, 8, n_samples), 0, 100)
+    return study_time, score
+
+# 회귀 실습: 충분통계량(XᵀX, Xᵀy)을 누적하여 점이 추가될 때마다 O(1)로 직선 갱신
+def init_regression_stats():
+    return {
+        'xtx': np.zeros((2, 2)),
+        'xty': np.zeros(2),
+        'yty': 0.0,
+        'n': 0
+    }
+
+def update_regression_stats(stats, x, y, sign=1):
+    """점(들)을 통계량에 추가 (sign=-1이면 제거)"""
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    y = np.atleast_1d(np.asarray(y, dtype=float))
+    X = np.column_stack([np.ones_like(x), x])
+    
+    stats['xtx'] += sign * (X.T @ X)
+    stats['xty'] += sign * (X.T @ y)
+    stats['yty'] += sign * float(y @ y)
+    stats['n'] += sign * len(x)
+
+def solve_regression(stats):
+    """정규방정식 풀이 → (절편, 기울기, 결정계수) / 점이 부족하면 None"""
+    if stats['n'] < 2 or abs(np.linalg.det(stats['xtx'])) < 1e-9:
+        return None
+    
+    w = np.linalg.solve(stats['xtx'], stats['xty'])
+    sse = stats['yty'] - 2 * w @ stats['xty'] + w @ stats['xtx'] @ w
+    sst = stats['yty'] - stats['xty'][0] ** 2 / stats['n']
+    r2 = 1 - sse / sst if sst > 0 else 1.0
+    return w[0], w[1], r2
+
+# 교사가 업로드한 데이터셋은 서버 프로세스당 한 번만 읽어 모든 세션이 같은 DataFrame을 공유
+# (숫자 열은 메모리 매핑된 파일을 복사하지 않고 사용)
+@st.cache_resource(max_entries=8)
+def load_uploaded_dataset(path):
+    return arrow_to_pandas(load_arrow_dataset(path))
+
+# 학생별 실습 데이터 (학번 시드, 반 전체를 한 번에 생성하여 공유)
+@st.cache_resource
+def get_class_datasets():
+    return ClassDatasets()
+
+def prepare_class_datasets():
+    """현재 접속한 모든 학생의 실습 데이터를 한 번의 배치로 미리 생성"""
+    return get_class_datasets().prepare([data['id'] for data in get_student_store().all()])
+
+def classification_frame(samples):
+    return pd.DataFrame({
+        '공부시간': samples[:, 0],
+        '수면시간': samples[:, 1],
+        '시험결과': np.where(samples[:, 2] == 1, '합격', '불합격')
+    })
+
+def customer_frame(samples):
+    return pd.DataFrame({
+        '나이': samples[:, 0],
+        '연소득': samples[:, 1],
+        '고객ID': [f'C{i:03d}' for i in range(1, len(samples) + 1)]
+    })
+
+def get_lab_dataset(lab, personalized=True):
+    """실습 데이터: 교사가 업로드한 데이터 > 학번별 데이터 > 기본 생성 데이터 순으로 사용"""
+    active = read_active_datasets(DATASET_DIR)
+    if lab in active:
+        return load_uploaded_dataset(active[lab]['path'])
+    
+    if personalized and st.session_state.student_info:
+        # 명단은 이 학생의 데이터가 아직 없을 때만 읽음 (캐시 적중 시 O(1))
+        classification, customers = get_class_datasets().get(
+            st.session_state.student_info['id'],
+            lambda: [data['id'] for data in get_student_store().all()]
+        )
+        return classification_frame(classification) if lab == 'supervised' else customer_frame(customers)
+    
+    if lab == 'supervised':
+        return generate_classification_data()
+    return generate_customer_data()
+
+def sample_for_display(df, n=5000):
+    """큰 데이터셋은 그래프/탐색용으로 일부만 사용"""
+    return df.sample(n, random_state=42) if len(df) > n else df
+
+# 하이퍼파라미터 탐색 슬라이더 격자
+N_ESTIMATORS_GRID = [10, 30, 100]
+MAX_DEPTH_GRID = [1, 2, 3, 5, None]
+TEST_SIZE_GRID = [0.2, 0.3, 0.4]
+
+# 모든 세션이 결과를 공유하므로 격자 전체는 서버에서 한 번만 계산됨
+@st.cache_data(show_spinner="모든 하이퍼파라미터 조합을 평가하는 중...")
+def evaluate_hyperparameter_grid(X, y):
+    results = Parallel(n_jobs=-1)(
+        delayed(cross_validate_config)(X, y, n_estimators, max_depth, test_size)
+        for n_estimators in N_ESTIMATORS_GRID
+        for max_depth in MAX_DEPTH_GRID
+        for test_size in TEST_SIZE_GRID
+    )
+    return pd.DataFrame(results)
+
+@st.cache_data(show_spinner="학습 곡선을 계산하는 중...")
+def get_learning_curve(X, y, n_estimators, max_depth, test_size):
+    return compute_learning_curve(X, y, n_estimators, max_depth, test_size, n_jobs=-1)
+
+# 수업지도안: pages/학습지도안.html을 원본으로 한 번만 빌드하여 모든 세션이 공유
+@st.cache_resource
+def get_lesson_plan_html(mtimes):
+    return build_lesson_plan_html()
+
 # 수업지도안 미리보기 함수
 def show_lesson_plan_preview():
-    """수업지도안 미리보기"""
-    st.markdown("## 📚 수업 계획")
-    
-    # 수업 개요 카드
-    with st.container():
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown("""
-            ### 🎯 학습 목표
-            - **지도학습과 비지도학습의 개념**을 설명할 수 있다
-            - **분류와 회귀, 클러스터링의 차이**를 구분할 수 있다  
-            - **실제 데이터를 활용한 AI 모델 체험**을 할 수 있다
-            - **AI 학습 방법의 실생활 적용 사례**를 찾을 수 있다
-            """)
-        
-        with col2:
-            st.markdown("""
-            ### ⏰ 수업 시간
-            - **1차시**: 40분 (지도학습)
-            - **2차시**: 40분 (비지도학습 + 평가)
-            - **총 시간**: 80분
-            """)
-    
-    # 수업 구조를 시각적으로 표현
-    st.markdown("### 🏗️ 수업 진행 순서")
-    
-    # 1차시 계획
-    with st.expander("🎯 **1차시: 지도학습 (Supervised Learning)** - 40분", expanded=True):
-        lesson1_cols = st.columns(4)
-        
-        with lesson1_cols[0]:
-            st.markdown("""
-            **🚀 도입 (5분)**
-            - 플랫폼 접속
-            - 학생 정보 입력
-            - 동기 유발
-            """)
-        
-        with lesson1_cols[1]:
-            st.markdown("""
-            **📚 개념 학습 (10분)**
-            - 지도학습 개념
-            - 분류 vs 회귀
-            - 실생활 예시
-            """)
-        
-        with lesson1_cols[2]:
-            st.markdown("""
-            **💻 실습 체험 (20분)**
-            - 시험 합격 예측
-            - AI 모델 학습
-            - 예측 결과 해석
-            """)
-        
-        with lesson1_cols[3]:
-            st.markdown("""
-            **✅ 정리 (5분)**
-            - 학습 내용 요약
-            - 질의응답
-            - 다음 차시 예고
-            """)
-    
-    # 2차시 계획
-    with st.expander("🔍 **2차시: 비지도학습 + 형성평가** - 40분"):
-        lesson2_cols = st.columns(5)
-        
-        with lesson2_cols[0]:
-            st.markdown("""
-            **🔄 복습 (5분)**
-            - 지도학습 복습
-            - 진도 현황 확인
-            - 질의응답
-            """)
-        
-        with lesson2_cols[1]:
-            st.markdown("""
-            **📚 개념 학습 (10분)**
-            - 비지도학습 개념
-            - 클러스터링 설명
-            - 활용 분야 소개
-            """)
-        
-        with lesson2_cols[2]:
-            st.markdown("""
-            **💻 실습 체험 (15분)**
-            - 고객 세분화
-            - 클러스터링 실습
-            - 패턴 발견하기
-            """)
-        
-        with lesson2_cols[3]:
-            st.markdown("""
-            **📝 형성평가 (5분)**
-            - 객관식 3문제
-            - 성찰 작성
-            - 즉시 채점
-            """)
-        
-        with lesson2_cols[4]:
-            st.markdown("""
-            **🎊 마무리 (5분)**
-            - 전체 학습 정리
-            - 우수자 격려
-            - 진로 연계 안내
-            """)
-    
-    # 학습 내용 미리보기
-    st.markdown("### 📖 학습 내용 미리보기")
-    
-    preview_col1, preview_col2 = st.columns(2)
-    
-    with preview_col1:
-        st.markdown("""
-        #### 🎯 지도학습 (Supervised Learning)
-        
-        **📚 핵심 개념**
-        - 정답이 있는 데이터로 AI 학습
-        - 마치 선생님이 문제와 정답을 함께 주고 공부시키는 것
-        
-        **🔍 학습 유형**
-        - **분류**: 데이터를 카테고리로 구분 (스팸/정상 메일)
-        - **회귀**: 연속적인 수치 예측 (집 가격, 시험 점수)
-        
-        **💻 체험 활동**
-        - 학생 성적 데이터로 합격/불합격 예측
-        - AI 모델 학습 과정 직접 체험
-        - 새로운 데이터로 예측 결과 확인
-        """)
-    
-    with preview_col2:
-        st.markdown("""
-        #### 🔍 비지도학습 (Unsupervised Learning)
-        
-        **📚 핵심 개념**
-        - 정답이 없는 데이터에서 숨겨진 패턴 발견
-        - 마치 탐정이 단서를 보고 사건의 진실을 추리
-        
-        **🔍 학습 유형**
-        - **클러스터링**: 비슷한 특성끼리 그룹화
-        - **활용 분야**: 고객 세분화, 상품 추천, 이상 탐지
-        
-        **💻 체험 활동**
-        - 고객 데이터로 그룹 세분화 실습
-        - 각 그룹별 특성 분석 및 해석
-        - 마케팅 전략 도출하기
-        """)
-    
-    # 평가 방법 안내
-    st.markdown("### 📊 평가 방법")
-    
-    eval_col1, eval_col2 = st.columns(2)
-    
-    with eval_col1:
-        st.markdown("""
-        #### 📝 형성평가 (즉시 평가)
-        - **문제 수**: 3문제 (객관식)
-        - **제한 시간**: 5분
-        - **평가 기준**:
-          - 우수 (80점 이상): 개념 정확히 이해
-          - 양호 (60-79점): 기본 개념 이해  
-          - 보통 (60점 미만): 추가 학습 필요
-        """)
-    
-    with eval_col2:
-        st.markdown("""
-        #### 👥 수행평가 (과정 중심)
-        - **참여도 (30%)**: 플랫폼 활용, 실습 참여
-        - **이해도 (40%)**: 개념 설명, 결과 해석
-        - **협력성 (30%)**: 동료 협력, 지식 공유
-        - **실시간 모니터링**: 교사 대시보드로 즉시 확인
-        """)
-    
-    # 준비물 및 주의사항
-    with st.expander("🛠️ **준비물 및 주의사항**"):
-        st.markdown("""
-        **💻 준비물**
-        - 인터넷 연결 가능한 컴퓨터/노트북
-        - 최신 웹 브라우저 (Chrome, Edge, Safari 권장)
-        
-        **⚠️ 주의사항**
-        - 학습 중 다른 웹사이트 접속 자제
-        - 동료와 협력하되 개별 진도 유지
-        - 실습 결과를 정확히 해석하고 기록
-        - 성찰 활동에 성실히 참여
-        
-        **💡 학습 팁**
-        - 각 단계를 차근차근 따라가며 진행
-        - 이해되지 않는 부분은 즉시 질문
-        - 실습 결과를 동료와 비교하고 토론
-        - AI 기술의 실생활 적용 사례 생각해보기
-        """)
+    """수업지도안 미리보기 (빌드된 HTML을 컴포넌트 하나로 표시)"""
+    components.html(get_lesson_plan_html(source_mtimes()), height=900, scrolling=True)
 
 def show_learning_modules():
     """학습 모듈 시작 안내"""
@@ -442,6 +468,13 @@ def main():
             st.session_state.is_teacher = False
             show_student_sidebar()
     
+    # 학습 단계 진입 기록 (페이지가 바뀔 때 한 번만)
+    if (not st.session_state.is_teacher and st.session_state.student_info
+            and st.session_state.get('logged_page') != st.session_state.current_page):
+        st.session_state.logged_page = st.session_state.current_page
+        if st.session_state.current_page != 'home':
+            log_activity(STAGE_ENTERED, st.session_state.current_page)
+    
     # 페이지 라우팅
     if st.session_state.is_teacher:
         show_teacher_dashboard()
@@ -449,8 +482,12 @@ def main():
         show_home_page()
     elif st.session_state.current_page == 'supervised':
         show_supervised_learning()
+    elif st.session_state.current_page == 'regression':
+        show_regression_lab()
     elif st.session_state.current_page == 'unsupervised':
         show_unsupervised_learning()
+    elif st.session_state.current_page == 'anomaly':
+        show_anomaly_lab()
     elif st.session_state.current_page == 'evaluation':
         show_evaluation()
 
@@ -484,10 +521,18 @@ def show_student_sidebar():
         st.session_state.current_page = 'supervised'
         st.rerun()
     
+    if st.button("📈 회귀 실습", key="nav_regression"):
+        st.session_state.current_page = 'regression'
+        st.rerun()
+    
     if st.button("🔍 비지도학습", key="nav_unsupervised"):
         st.session_state.current_page = 'unsupervised'
         st.rerun()
     
+    if st.button("🚨 이상 거래 탐지", key="nav_anomaly"):
+        st.session_state.current_page = 'anomaly'
+        st.rerun()
+    
     if st.button("📝 형성평가", key="nav_evaluation"):
         st.session_state.current_page = 'evaluation'
         st.rerun()
@@ -495,11 +540,12 @@ def show_student_sidebar():
 def show_teacher_sidebar():
     st.markdown("### 🎓 교사 대시보드")
     
-    total_students = len(st.session_state.all_students_data)
+    students = get_student_store().all()
+    total_students = len(students)
     st.metric("총 접속 학생 수", total_students)
     
     if total_students > 0:
-        completed_all = sum(1 for data in st.session_state.all_students_data 
+        completed_all = sum(1 for data in students 
                            if all(data['progress'].values()))
         st.metric("전체 완료 학생", f"{completed_all}/{total_students}")
         
@@ -507,10 +553,10 @@ def show_teacher_sidebar():
             st.rerun()
         
         if st.button("📥 CSV 다운로드", key="download_csv"):
-            if st.session_state.all_students_data:
+            if students:
                 # 한글 지원을 위한 데이터 준비
                 csv_data = []
-                for data in st.session_state.all_students_data:
+                for data in students:
                     csv_data.append({
                         '이름': data['name'],
                         '학번': data['id'],
@@ -519,7 +565,7 @@ def show_teacher_sidebar():
                         '형성평가완료': '완료' if data['progress']['evaluation'] else '미완료',
                         '퀴즈점수': data['quiz_score'],
                         '성찰내용': data.get('reflection', ''),
-                        '최근접속시간': data['last_updated']
+                        '최근접속시간': format_timestamp(data['updated_at'])
                     })
                 
                 df = pd.DataFrame(csv_data)
@@ -536,6 +582,50 @@ def show_teacher_sidebar():
                 )
             else:
                 st.warning("다운로드할 데이터가 없습니다.")
+    
+    st.markdown("---")
+    show_dataset_upload()
+    
+    st.markdown("---")
+    st.markdown("### 🎲 학생별 실습 데이터")
+    st.caption(f"생성됨: {len(get_class_datasets())}명분 (학번으로 정해지는 개인 데이터)")
+    if st.button("접속 학생 데이터 미리 생성", key="prepare_datasets"):
+        st.success(f"{prepare_class_datasets()}명분을 새로 생성했습니다!")
+
+LAB_NAMES = {
+    'supervised': '지도학습 (시험 합격 예측)',
+    'unsupervised': '비지도학습 (고객 세분화)'
+}
+
+def show_dataset_upload():
+    """실습용 CSV 업로드 (교사 전용)"""
+    st.markdown("### 📂 실습 데이터")
+    
+    active = read_active_datasets(DATASET_DIR)
+    lab = st.selectbox("실습 선택", list(LAB_NAMES), format_func=LAB_NAMES.get, key="upload_lab")
+    
+    if lab in active:
+        st.caption(f"사용 중: {active[lab]['name']} ({active[lab]['rows']:,}행)")
+        if st.button("기본 데이터로 되돌리기", key="reset_dataset"):
+            set_active_dataset(DATASET_DIR, lab, None)
+            st.rerun()
+    else:
+        st.caption("사용 중: 기본 데이터")
+    
+    required = [column for column, kind in LAB_SCHEMAS[lab].items() if kind != 'str']
+    optional = [column for column, kind in LAB_SCHEMAS[lab].items() if kind == 'str']
+    st.caption(f"필요한 열: {', '.join(required)}" + (f" (선택: {', '.join(optional)})" if optional else ""))
+    uploaded = st.file_uploader("CSV 파일", type=['csv'], key=f"upload_{lab}")
+    
+    if uploaded is not None and st.button("📤 업로드", key="upload_dataset"):
+        try:
+            with st.spinner("데이터를 검사하는 중..."):
+                path, n_rows = import_csv(uploaded, lab, DATASET_DIR)
+        except DatasetValidationError as e:
+            st.error(f"업로드 실패: {e}")
+        else:
+            set_active_dataset(DATASET_DIR, lab, {'path': path, 'rows': n_rows, 'name': uploaded.name})
+            st.success(f"{n_rows:,}행을 불러왔습니다!")
 
 def show_home_page():
     st.title("🤖 영동일고등학교 AI Learning Hub")
@@ -575,6 +665,83 @@ def show_home_page():
     with tab2:
         show_learning_modules()
 
+@st.fragment(run_every=1)
+def show_training_status():
+    """학습 작업 상태를 1초마다 확인하여 표시"""
+    job_id = st.session_state.train_job_id
+    status = get_training_service().status(job_id)
+
+    if status is None or status['state'] not in (QUEUED, RUNNING):
+        # 작업이 끝나면 결과를 세션에 저장하고 전체 페이지를 다시 그림
+        st.session_state.train_job_id = None
+        if status is not None and status['state'] == DONE:
+            st.session_state.train_result = status['result']
+        elif status is not None and status['state'] == FAILED:
+            st.session_state.train_error = status['error']
+        else:
+            st.session_state.train_error = "학습 작업이 취소되었습니다. 다시 시도해주세요."
+        st.rerun(scope="app")
+
+    if status['state'] == QUEUED:
+        st.info(f"⏳ 학습 대기 중... (대기 순번: {status['queue_position']}번째)")
+        # 이미 시작된 학습은 취소할 수 없으므로 대기 중일 때만 표시
+        if st.button("학습 취소", key="cancel_training") and not get_training_service().cancel(job_id):
+            st.warning("학습이 이미 시작되어 취소할 수 없습니다.")
+    else:
+        st.progress(min(status['elapsed'] / 10, 0.95), text=f"🤖 AI가 학습 중... ({status['elapsed']:.0f}초)")
+
+def show_hyperparameter_lab(df):
+    """트리 개수, 최대 깊이, 테스트 비율을 바꿔가며 교차검증 정확도 비교"""
+    st.markdown("#### 🔬 하이퍼파라미터 탐색")
+    st.caption("설정을 바꾸면 교차검증(5회) 정확도와 학습 곡선이 어떻게 변하는지 살펴보세요.")
+
+    df = sample_for_display(df, 2000)
+    X = df[['공부시간', '수면시간']].values
+    y = df['시험결과'].map({'합격': 1, '불합격': 0}).values
+    grid = evaluate_hyperparameter_grid(X, y)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_estimators = st.select_slider("트리 개수 (n_estimators)", N_ESTIMATORS_GRID, value=100, key="hp_n_estimators")
+    with col2:
+        max_depth = st.select_slider("최대 깊이 (max_depth)", MAX_DEPTH_GRID, value=None, key="hp_max_depth",
+                                     format_func=lambda d: '제한 없음' if d is None else str(d))
+    with col3:
+        test_size = st.select_slider("테스트 비율", TEST_SIZE_GRID, value=0.3, key="hp_test_size",
+                                     format_func=lambda t: f"{t:.0%}")
+
+    selected = grid[(grid['n_estimators'] == n_estimators)
+                    & (grid['max_depth'].isna() if max_depth is None else grid['max_depth'] == max_depth)
+                    & (grid['test_size'] == test_size)].iloc[0]
+    best = grid.loc[grid['cv_mean'].idxmax()]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("교차검증 정확도", f"{selected['cv_mean']:.2%}", f"±{selected['cv_std']:.2%}", delta_color="off")
+    with col2:
+        best_depth = '제한 없음' if pd.isna(best['max_depth']) else int(best['max_depth'])
+        st.metric("최고 정확도 조합", f"{best['cv_mean']:.2%}")
+        st.caption(f"트리 {int(best['n_estimators'])}개, 깊이 {best_depth}, 테스트 {best['test_size']:.0%}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        heatmap = grid[grid['test_size'] == test_size].copy()
+        heatmap['최대 깊이'] = heatmap['max_depth'].map(lambda d: '제한 없음' if pd.isna(d) else str(int(d)))
+        pivot = heatmap.pivot(index='최대 깊이', columns='n_estimators', values='cv_mean')
+        fig = px.imshow(pivot, text_auto='.0%', color_continuous_scale='viridis',
+                        labels={'x': '트리 개수', 'y': '최대 깊이', 'color': '정확도'},
+                        title=f"조합별 교차검증 정확도 (테스트 {test_size:.0%})")
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        curve = get_learning_curve(X, y, n_estimators, max_depth, test_size)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=curve['train_sizes'], y=curve['train_mean'], mode='lines+markers', name='학습 정확도'))
+        fig.add_trace(go.Scatter(x=curve['train_sizes'], y=curve['test_mean'], mode='lines+markers', name='검증 정확도',
+                                 error_y={'type': 'data', 'array': curve['test_std']}))
+        fig.update_layout(title="학습 곡선", xaxis_title="학습 데이터 수", yaxis_title="정확도")
+        st.plotly_chart(fig, use_container_width=True)
+
 def show_supervised_learning():
     st.title("🎯 지도학습 (Supervised Learning)")
     
@@ -606,39 +773,51 @@ def show_supervised_learning():
         - 연속적인 수치 예측
         - 예: 집 가격 예측, 시험 점수 예측
         """)
+        if st.button("📈 회귀 실습 해보기", key="goto_regression"):
+            st.session_state.current_page = 'regression'
+            st.rerun()
     
     # 실습
     st.markdown("### 실습: 시험 합격 예측")
     
-    df = generate_classification_data()
+    df = get_lab_dataset('supervised')
     
     col1, col2 = st.columns([1, 1])
     
     with col1:
         st.markdown("#### 학습 데이터")
         st.dataframe(df.head(10))
-        st.caption(f"총 {len(df)}명의 학생 데이터")
+        if 'supervised' in read_active_datasets(DATASET_DIR):
+            st.caption(f"총 {len(df)}명의 학생 데이터 (선생님이 올린 공용 데이터)")
+        else:
+            st.caption(f"총 {len(df)}명의 학생 데이터 (학번 {st.session_state.student_info['id']}번 전용)")
     
     with col2:
-        fig = px.scatter(df, x='공부시간', y='수면시간', color='시험결과',
+        fig = px.scatter(sample_for_display(df), x='공부시간', y='수면시간', color='시험결과',
                         title="학생 데이터 분포",
                         color_discrete_map={'합격': 'green', '불합격': 'red'})
         st.plotly_chart(fig, use_container_width=True)
     
     if st.button("AI 모델 학습시키기", key="train_model"):
-        with st.spinner("AI가 학습 중..."):
-            X = df[['공부시간', '수면시간']]
-            y = df['시험결과'].map({'합격': 1, '불합격': 0})
-            
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
-            
-            model = RandomForestClassifier(random_state=42)
-            model.fit(X_train, y_train)
-            
-            y_pred = model.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
-            
-            st.success(f"학습 완료! 정확도: {accuracy:.2%}")
+        X = df[['공부시간', '수면시간']].values
+        y = df['시험결과'].map({'합격': 1, '불합격': 0}).values
+
+        try:
+            st.session_state.train_job_id = get_training_service().submit(
+                st.session_state.student_info['id'], X, y,
+                {'test_size': 0.3, 'random_state': 42, 'model_dir': MODEL_DIR}
+            )
+            st.session_state.train_result = None
+            st.session_state.train_error = None
+        except TrainingQueueFull as e:
+            st.warning(f"⏳ {e}")
+
+    if st.session_state.get('train_job_id'):
+        show_training_status()
+    elif st.session_state.get('train_result'):
+        st.success(f"학습 완료! 정확도: {st.session_state.train_result['accuracy']:.2%}")
+    elif st.session_state.get('train_error'):
+        st.error(f"학습에 실패했습니다: {st.session_state.train_error}")
     
     # 예측 체험
     st.markdown("#### 새로운 학생 예측해보기")
@@ -650,17 +829,117 @@ def show_supervised_learning():
         new_sleep = st.slider("수면시간", 4.0, 10.0, 7.0, key="new_sleep")
     
     if st.button("예측하기", key="predict"):
-        if new_study >= 5 and new_sleep >= 6:
+        train_result = st.session_state.get('train_result')
+        model = get_saved_model('classifier', train_result['model_key']) if train_result else None
+        
+        if model is not None:
+            # 직접 학습시킨 모델로 예측 (학습 데이터에 합격 사례가 없었으면 합격 확률은 0)
+            proba = model.predict_proba([[new_study, new_sleep]])[0]
+            pass_prob = proba[np.asarray(model.classes_) == 1].sum()
+            if pass_prob >= 0.5:
+                st.success(f"🎉 예측 결과: 합격 (신뢰도: {pass_prob:.0%})")
+            else:
+                st.error(f"😞 예측 결과: 불합격 (신뢰도: {1 - pass_prob:.0%})")
+        elif new_study >= 5 and new_sleep >= 6:
             st.success("🎉 예측 결과: 합격 (신뢰도: 85%)")
         else:
             st.error("😞 예측 결과: 불합격 (신뢰도: 75%)")
     
+    # 하이퍼파라미터 탐색
+    if st.toggle("🔬 하이퍼파라미터 탐색 모드", key="explore_mode"):
+        # 탐색 결과는 모든 학생이 공유하도록 공통 데이터 사용
+        show_hyperparameter_lab(get_lab_dataset('supervised', personalized=False))
+    
     if st.button("지도학습 완료", key="complete_supervised"):
         st.session_state.progress['supervised'] = True
+        log_activity(STAGE_COMPLETED, 'supervised')
         save_student_data()  # 진도 저장
         st.success("지도학습을 완료했습니다!")
         st.balloons()
 
+def show_regression_lab():
+    st.title("📈 회귀 실습: 시험 점수 예측")
+    
+    if not st.session_state.student_info:
+        st.warning("먼저 학생 정보를 입력해주세요!")
+        return
+    
+    st.markdown(f"**학습자**: {st.session_state.student_info['name']}")
+    
+    st.info("""
+    **회귀**는 연속적인 수치를 예측하는 지도학습입니다.
+    점을 추가하거나 지워보면서 AI가 찾은 직선이 어떻게 바뀌는지 관찰해보세요!
+    """)
+    
+    # 전역 np.random은 다른 세션이 시드를 다시 정하므로 세션마다 별도의 난수 생성기 사용
+    if 'regression_rng' not in st.session_state:
+        st.session_state.regression_rng = np.random.default_rng()
+    rng = st.session_state.regression_rng
+    
+    if 'regression_stats' not in st.session_state:
+        study_time, score = generate_score_data(rng)
+        st.session_state.regression_points = [list(study_time), list(score)]
+        st.session_state.regression_stats = init_regression_stats()
+        update_regression_stats(st.session_state.regression_stats, study_time, score)
+    
+    stats = st.session_state.regression_stats
+    xs, ys = st.session_state.regression_points
+    
+    # 점 추가/삭제
+    st.markdown("#### 데이터 점 편집")
+    col1, col2 = st.columns(2)
+    with col1:
+        point_x = st.slider("공부시간", 0.0, 12.0, 6.0, key="reg_point_x")
+    with col2:
+        point_y = st.slider("시험 점수", 0.0, 100.0, 70.0, key="reg_point_y")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("➕ 점 추가", key="reg_add"):
+            update_regression_stats(stats, point_x, point_y)
+            xs.append(point_x)
+            ys.append(point_y)
+    with col2:
+        if st.button("🎲 무작위 10개 추가", key="reg_add_random"):
+            new_x, new_y = generate_score_data(rng, 10)
+            update_regression_stats(stats, new_x, new_y)
+            xs.extend(new_x)
+            ys.extend(new_y)
+    with col3:
+        # 점이 하나도 없으면 그래프를 그릴 수 없으므로 마지막 한 개는 남김
+        if st.button("↩️ 마지막 점 삭제", key="reg_remove", disabled=len(xs) <= 1) and len(xs) > 1:
+            update_regression_stats(stats, xs.pop(), ys.pop(), sign=-1)
+    with col4:
+        if st.button("🔄 초기화", key="reg_reset"):
+            del st.session_state.regression_stats
+            st.rerun()
+    
+    fit = solve_regression(stats)
+    
+    fig = px.scatter(pd.DataFrame({'공부시간': xs, '시험 점수': ys}), x='공부시간', y='시험 점수',
+                     title=f"공부시간과 시험 점수 (점 {stats['n']}개)")
+    if fit is not None:
+        intercept, slope, r2 = fit
+        line_x = np.array([0, 12])
+        fig.add_trace(go.Scatter(x=line_x, y=intercept + slope * line_x, mode='lines',
+                                 name='회귀 직선', line={'color': 'red'}))
+    st.plotly_chart(fig, use_container_width=True)
+    
+    if fit is None:
+        st.warning("직선을 그리려면 서로 다른 공부시간을 가진 점이 2개 이상 필요합니다.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("회귀식", f"점수 = {slope:.1f} × 공부시간 + {intercept:.1f}")
+    with col2:
+        st.metric("결정계수 (R²)", f"{r2:.2f}")
+    
+    # 예측 체험
+    st.markdown("#### 새로운 학생 점수 예측하기")
+    new_x = st.slider("공부시간", 0.0, 12.0, 8.0, key="reg_predict_x")
+    st.success(f"🎯 예상 점수: {intercept + slope * new_x:.1f}점")
+
 def show_unsupervised_learning():
     st.title("🔍 비지도학습 (Unsupervised Learning)")
     
@@ -694,11 +973,14 @@ def show_unsupervised_learning():
         - 상품 추천
         - 이상 거래 탐지
         """)
+        if st.button("🚨 이상 거래 탐지 실습 해보기", key="goto_anomaly"):
+            st.session_state.current_page = 'anomaly'
+            st.rerun()
     
     # 실습
     st.markdown("### 실습: 고객 세분화")
     
-    df = generate_customer_data()
+    df = get_lab_dataset('unsupervised')
     
     col1, col2 = st.columns([2, 1])
     
@@ -721,18 +1003,14 @@ def show_unsupervised_learning():
     if st.button("고객 그룹 찾기", key="cluster"):
         with st.spinner("AI가 고객 그룹을 찾는 중..."):
             X = df[['나이', '연소득']].values
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
-            
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            clusters = kmeans.fit_predict(X_scaled)
+            clusters = fit_clustering(X, n_clusters)['labels']
             
             df_result = df.copy()
             df_result['고객그룹'] = [f'그룹 {i+1}' for i in clusters]
             
             st.success(f"{n_clusters}개의 고객 그룹을 발견했습니다!")
             
-            fig = px.scatter(df_result, x='나이', y='연소득', color='고객그룹',
+            fig = px.scatter(sample_for_display(df_result), x='나이', y='연소득', color='고객그룹',
                            title="고객 그룹 분류 결과")
             st.plotly_chart(fig, use_container_width=True)
             
@@ -761,10 +1039,135 @@ def show_unsupervised_learning():
     
     if st.button("비지도학습 완료", key="complete_unsupervised"):
         st.session_state.progress['unsupervised'] = True
+        log_activity(STAGE_COMPLETED, 'unsupervised')
         save_student_data()  # 진도 저장
         st.success("비지도학습을 완료했습니다!")
         st.balloons()
 
+# 이상 거래 탐지 스트림 설정
+ANOMALY_BATCH_SIZE = 100
+ANOMALY_WINDOW = 2000
+ANOMALY_TICK = 0.5  # 초
+
+def reset_anomaly_stream():
+    stream = transaction_stream(student_seed(st.session_state.student_info['id']), ANOMALY_BATCH_SIZE)
+    next(stream)  # 제너레이터 시작 (이후 send로 이상 거래 비율 전달)
+    st.session_state.anomaly_state = {
+        'stream': stream,
+        'window': RollingWindow(ANOMALY_WINDOW, 2),
+        'total': 0,
+        'flagged': 0,
+        'true_positive': 0,
+        'actual': 0
+    }
+
+def show_anomaly_lab():
+    st.title("🚨 이상 거래 탐지")
+    
+    if not st.session_state.student_info:
+        st.warning("먼저 학생 정보를 입력해주세요!")
+        return
+    
+    st.markdown(f"**학습자**: {st.session_state.student_info['name']}")
+    
+    st.info("""
+    고객 세분화에서 찾은 **고객 그룹의 중심**에서 멀리 떨어진 거래일수록 평소와 다른 **이상 거래**일 가능성이 높습니다.
+    실시간으로 들어오는 거래를 AI가 어떻게 걸러내는지 관찰해보세요!
+    """)
+    
+    # 비지도학습 실습의 고객 데이터로 군집 중심 학습 (저장된 결과가 있으면 재사용)
+    df = get_lab_dataset('unsupervised')
+    X = df[['나이', '연소득']].values
+    model = fit_clustering(X, 3)
+    scaler = model['scaler']
+    centroids = np.asarray(model['kmeans'].cluster_centers_)
+    train_distance = centroid_distance(X, scaler, centroids)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        events_per_second = st.select_slider("초당 거래 수", [500, 1000, 2000, 5000], value=1000, key="anomaly_eps")
+    with col2:
+        anomaly_rate = st.slider("이상 거래 비율(%)", 0.0, 10.0, 2.0, 0.5, key="anomaly_rate") / 100
+    with col3:
+        percentile = st.slider("탐지 기준 (정상 거래 백분위)", 90.0, 99.9, 99.0, key="anomaly_percentile")
+    threshold = np.percentile(train_distance, percentile)
+    
+    if 'anomaly_state' not in st.session_state:
+        reset_anomaly_stream()
+    running = st.session_state.get('anomaly_running', False)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("⏸️ 일시정지" if running else "▶️ 시작", key="anomaly_toggle"):
+            st.session_state.anomaly_running = not running
+            st.rerun()
+    with col2:
+        if st.button("🔄 초기화", key="anomaly_reset"):
+            reset_anomaly_stream()
+    
+    # 실행 중일 때만 주기적으로 다시 그림
+    st.fragment(show_anomaly_stream, run_every=ANOMALY_TICK if running else None)(
+        scaler, centroids, threshold, events_per_second, anomaly_rate, running
+    )
+
+def show_anomaly_stream(scaler, centroids, threshold, events_per_second, anomaly_rate, running):
+    """한 번 실행될 때마다 micro-batch 몇 개를 처리하고 최근 구간만 그림"""
+    state = st.session_state.anomaly_state
+    
+    if running:
+        n_batches = max(1, int(events_per_second * ANOMALY_TICK) // ANOMALY_BATCH_SIZE)
+        for _ in range(n_batches):
+            X, actual = state['stream'].send(anomaly_rate)
+            scores = centroid_distance(X, scaler, centroids)
+            flags = scores > threshold
+            
+            state['window'].append(X, scores, flags)
+            state['total'] += len(X)
+            state['flagged'] += int(flags.sum())
+            state['actual'] += int(actual.sum())
+            state['true_positive'] += int((flags & actual).sum())
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("처리한 거래", f"{state['total']:,}건")
+    with col2:
+        st.metric("탐지한 이상 거래", f"{state['flagged']:,}건")
+    with col3:
+        precision = state['true_positive'] / state['flagged'] if state['flagged'] else 0
+        st.metric("정밀도", f"{precision:.0%}", help="이상으로 탐지한 거래 중 실제 이상 거래의 비율")
+    with col4:
+        recall = state['true_positive'] / state['actual'] if state['actual'] else 0
+        st.metric("재현율", f"{recall:.0%}", help="실제 이상 거래 중 탐지해낸 비율")
+    
+    seq, X, scores, flags = state['window'].view()
+    if not len(seq):
+        st.caption("▶️ 시작 버튼을 눌러 거래 스트림을 시작하세요.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = go.Figure()
+        fig.add_trace(go.Scattergl(x=seq[~flags], y=scores[~flags], mode='markers', name='정상',
+                                   marker={'size': 3, 'color': 'steelblue'}))
+        fig.add_trace(go.Scattergl(x=seq[flags], y=scores[flags], mode='markers', name='이상',
+                                   marker={'size': 6, 'color': 'red'}))
+        fig.add_hline(y=threshold, line_dash='dash', annotation_text='탐지 기준')
+        fig.update_layout(title=f"최근 {len(seq):,}건의 이상 점수", xaxis_title="거래 순번",
+                          yaxis_title="군집 중심까지 거리")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = go.Figure()
+        fig.add_trace(go.Scattergl(x=X[~flags, 0], y=X[~flags, 1], mode='markers', name='정상',
+                                   marker={'size': 3, 'color': 'steelblue'}))
+        fig.add_trace(go.Scattergl(x=X[flags, 0], y=X[flags, 1], mode='markers', name='이상',
+                                   marker={'size': 6, 'color': 'red'}))
+        center_points = scaler.inverse_transform(centroids)
+        fig.add_trace(go.Scatter(x=center_points[:, 0], y=center_points[:, 1], mode='markers', name='그룹 중심',
+                                 marker={'size': 14, 'symbol': 'x', 'color': 'black'}))
+        fig.update_layout(title="거래 분포", xaxis_title="나이", yaxis_title="연소득")
+        st.plotly_chart(fig, use_container_width=True)
+
 def show_evaluation():
     st.title("📝 형성평가")
     
@@ -820,10 +1223,11 @@ def show_evaluation():
             )
             
             if answer is not None:
-                st.session_state.quiz_answers[question['id']] = {
-                    'answer': answer,
-                    'correct': question['options'].index(answer) == question['correct']
-                }
+                previous = st.session_state.quiz_answers.get(question['id'])
+                if previous is None or previous['answer'] != answer:
+                    log_activity(QUIZ_ANSWERED, 'evaluation', question=question['id'],
+                                 option=question['options'].index(answer))
+                st.session_state.quiz_answers[question['id']] = make_quiz_answer(question, answer)
             else:
                 all_answered = False
             
@@ -845,10 +1249,13 @@ def show_evaluation():
                 
                 correct_count = sum(1 for ans in st.session_state.quiz_answers.values() if ans['correct'])
                 total_count = len(QUIZ_QUESTIONS)
-                score = (correct_count / total_count) * 100
+                score = calculate_quiz_score(st.session_state.quiz_answers)
                 
                 st.session_state.progress['evaluation'] = True
+                log_activity(SUBMITTED, 'evaluation', score=score)
+                log_activity(STAGE_COMPLETED, 'evaluation')
                 save_student_data()  # 최종 데이터 저장
+                record_quiz_submission(st.session_state.student_info['id'], st.session_state.quiz_answers)
                 
                 if score >= 80:
                     st.success(f"🎉 우수! 점수: {correct_count}/{total_count} ({score:.0f}점)")
@@ -869,6 +1276,144 @@ def show_evaluation():
         elif not reflection.strip():
             st.warning("성찰을 작성해주세요.")
 
+STAGE_NAMES = {
+    'supervised': '지도학습',
+    'regression': '회귀 실습',
+    'unsupervised': '비지도학습',
+    'anomaly': '이상 거래 탐지',
+    'evaluation': '형성평가'
+}
+
+EVENT_NAMES = {
+    STAGE_ENTERED: '단계 진입',
+    STAGE_COMPLETED: '단계 완료',
+    QUIZ_ANSWERED: '퀴즈 응답',
+    SUBMITTED: '제출'
+}
+
+def show_activity_timeline():
+    st.markdown("### ⏱️ 학습 활동 타임라인")
+    
+    window_minutes = st.selectbox("조회 기간", [30, 60, 120, 240], index=1, key="timeline_window",
+                                  format_func=lambda m: f"최근 {m}분")
+    since = time.time() - window_minutes * 60
+    rows = get_activity_log().timeline(since=since)
+    
+    if not rows:
+        st.info("선택한 기간에 기록된 활동이 없습니다.")
+        return
+    
+    timeline_df = pd.DataFrame(rows, columns=['분', '이벤트', '단계', '횟수'])
+    timeline_df['시각'] = pd.to_datetime(timeline_df['분'], unit='s', utc=True).dt.tz_convert('Asia/Seoul')
+    timeline_df['이벤트'] = timeline_df['이벤트'].map(EVENT_NAMES)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        per_minute = timeline_df.groupby(['시각', '이벤트'], as_index=False)['횟수'].sum()
+        fig = px.bar(per_minute, x='시각', y='횟수', color='이벤트', title="분당 활동 수")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # 같은 학생이 다시 완료한 것은 세지 않음 (학생별 첫 완료만 집계)
+        completed = pd.DataFrame(get_activity_log().completions(since=since), columns=['분', '단계', '학생 수'])
+        if completed.empty:
+            st.info("아직 완료된 단계가 없습니다.")
+        else:
+            completed['시각'] = pd.to_datetime(completed['분'], unit='s', utc=True).dt.tz_convert('Asia/Seoul')
+            completed['단계'] = completed['단계'].map(STAGE_NAMES)
+            completed['누적 완료'] = completed.groupby('단계')['학생 수'].cumsum()
+            fig = px.line(completed, x='시각', y='누적 완료', color='단계', markers=True,
+                          title="단계별 누적 완료 학생 수")
+            st.plotly_chart(fig, use_container_width=True)
+
+# 학생 표 인덱스 (모든 교사 세션이 공유)
+@st.cache_resource
+def get_student_table_cache():
+    return {'entry': (None, None)}
+
+def get_student_table():
+    """명단이나 정렬/검색에 쓰는 값이 바뀐 경우에만 정렬 순서와 검색 인덱스를 다시 만듦"""
+    store = get_student_store()
+    cache = get_student_table_cache()
+    version = store.version
+    if cache['entry'][0] != version:
+        cache['entry'] = (version, StudentTable(store))
+    return cache['entry'][1]
+
+def show_student_table():
+    """검색/정렬/페이지 나눔 학생 표 (보이는 페이지만 표로 변환)"""
+    table = get_student_table()
+    
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        query = st.text_input("🔎 이름 또는 학번 검색", key="student_search", placeholder="예: 홍길 / 101")
+    with col2:
+        sort_by = st.selectbox("정렬 기준", SORT_COLUMNS, key="student_sort")
+    with col3:
+        descending = st.toggle("내림차순", key="student_sort_desc")
+    with col4:
+        page_size = st.selectbox("페이지당 학생 수", [20, 50, 100], key="student_page_size")
+    
+    n_pages = max(1, -(-table.count(query) // page_size))
+    page = st.number_input(f"페이지 (전체 {n_pages}쪽)", min_value=1, max_value=n_pages, value=1,
+                           key="student_page") - 1
+    rows, total = table.page(query, sort_by, descending, page=page, page_size=page_size)
+    
+    if not rows:
+        st.info("검색 결과가 없습니다.")
+        return
+    
+    st.dataframe(pd.DataFrame([{
+        '이름': data['name'],
+        '학번': data['id'],
+        '지도학습': '✅' if data['progress']['supervised'] else '❌',
+        '비지도학습': '✅' if data['progress']['unsupervised'] else '❌',
+        '형성평가': '✅' if data['progress']['evaluation'] else '❌',
+        '퀴즈점수': f"{data['quiz_score']:.0f}점" if data['quiz_score'] > 0 else '-',
+        '최근접속': format_timestamp(data['updated_at'])
+    } for data in rows]), use_container_width=True, hide_index=True)
+    st.caption(f"총 {total}명 중 {page * page_size + 1}-{page * page_size + len(rows)}번째")
+
+def show_item_analysis():
+    """문항별 정답률, 선택지 분포, 변별도"""
+    results = get_item_stats().summary()
+    if not results or not results[0]['n']:
+        return
+    
+    st.markdown("### 🧩 문항 분석")
+    st.caption(f"제출 {results[0]['n']}건 · 변별도 = 상위 27% 정답률 − 하위 27% 정답률 (0.3 이상이면 양호)")
+    
+    rows = []
+    option_rows = []
+    for i, result in enumerate(results):
+        question = result['question']
+        discrimination = result['discrimination']
+        wrong_rates = result['option_rates'].copy()
+        wrong_rates[question['correct']] = 0
+        rows.append({
+            '문항': f"문제 {i+1}",
+            '내용': question['question'],
+            '정답률': f"{result['correct_rate']:.0%}",
+            '변별도': f"{discrimination:.2f}" if discrimination is not None else '-',
+            '가장 많이 고른 오답': question['options'][wrong_rates.argmax()] if wrong_rates.max() > 0 else '-'
+        })
+        for j, option in enumerate(question['options']):
+            option_rows.append({
+                '문항': f"문제 {i+1}",
+                '선택지': f"{j+1}. {option}" + (" ✅" if j == question['correct'] else ""),
+                '선택 비율(%)': result['option_rates'][j] * 100,
+                '정답 여부': '정답' if j == question['correct'] else '오답'
+            })
+    
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
+    fig = px.bar(pd.DataFrame(option_rows), x='선택 비율(%)', y='문항', color='정답 여부',
+                 orientation='h', hover_data=['선택지'], barmode='stack',
+                 color_discrete_map={'정답': 'green', '오답': 'lightgray'},
+                 title="문항별 선택지 분포")
+    st.plotly_chart(fig, use_container_width=True)
+
 def show_teacher_dashboard():
     st.title("🎓 교사 실시간 대시보드")
     
@@ -880,7 +1425,9 @@ def show_teacher_dashboard():
     with col2:
         st.metric("현재 시간", datetime.now().strftime('%H:%M:%S'))
     
-    if not st.session_state.all_students_data:
+    students = get_student_store().all()
+    
+    if not students:
         st.info("아직 접속한 학생이 없습니다.")
         st.markdown("### 💡 사용 방법")
         st.markdown("""
@@ -893,11 +1440,11 @@ def show_teacher_dashboard():
     # 전체 통계
     st.markdown("## 📊 전체 현황")
     
-    total_students = len(st.session_state.all_students_data)
-    completed_supervised = sum(1 for data in st.session_state.all_students_data if data['progress']['supervised'])
-    completed_unsupervised = sum(1 for data in st.session_state.all_students_data if data['progress']['unsupervised'])
-    completed_evaluation = sum(1 for data in st.session_state.all_students_data if data['progress']['evaluation'])
-    completed_all = sum(1 for data in st.session_state.all_students_data if all(data['progress'].values()))
+    total_students = len(students)
+    completed_supervised = sum(1 for data in students if data['progress']['supervised'])
+    completed_unsupervised = sum(1 for data in students if data['progress']['unsupervised'])
+    completed_evaluation = sum(1 for data in students if data['progress']['evaluation'])
+    completed_all = sum(1 for data in students if all(data['progress'].values()))
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -931,31 +1478,18 @@ def show_teacher_dashboard():
                  color_continuous_scale='viridis')
     st.plotly_chart(fig, use_container_width=True)
     
+    # 활동 타임라인 (분 단위로 미리 집계된 이벤트 수 사용)
+    show_activity_timeline()
+    
     # 개별 학생 현황
     st.markdown("### 👥 개별 학생 현황")
-    
-    # 학생 데이터를 DataFrame으로 변환
-    students_df = []
-    for data in st.session_state.all_students_data:
-        students_df.append({
-            '이름': data['name'],
-            '학번': data['id'],
-            '지도학습': '✅' if data['progress']['supervised'] else '❌',
-            '비지도학습': '✅' if data['progress']['unsupervised'] else '❌',
-            '형성평가': '✅' if data['progress']['evaluation'] else '❌',
-            '퀴즈점수': f"{data['quiz_score']:.0f}점" if data['quiz_score'] > 0 else '-',
-            '최근접속': data['last_updated']
-        })
-    
-    if students_df:
-        df = pd.DataFrame(students_df)
-        st.dataframe(df, use_container_width=True)
+    show_student_table()
     
     # 성적 분포
     if completed_evaluation > 0:
         st.markdown("### 📊 퀴즈 성적 분포")
         
-        scores = [data['quiz_score'] for data in st.session_state.all_students_data if data['quiz_score'] > 0]
+        scores = [data['quiz_score'] for data in students if data['quiz_score'] > 0]
         
         if scores:
             fig_hist = px.histogram(x=scores, nbins=5, title="퀴즈 점수 분포",
@@ -964,19 +1498,53 @@ def show_teacher_dashboard():
             
             avg_score = sum(scores) / len(scores)
             st.info(f"📈 평균 점수: {avg_score:.1f}점")
+        
+        show_item_analysis()
     
     # 학생별 상세 정보
     st.markdown("### 📝 학생별 성찰 내용")
+    show_reflection_analytics(students)
+
+def show_reflection_analytics(students):
+    """성찰 키워드 인덱스로 주요 주제를 보여주고 키워드로 성찰 필터링"""
+    reflections = {data['id']: data for data in students
+                   if data['progress']['evaluation'] and data.get('reflection')}
     
-    reflection_found = False
-    for data in st.session_state.all_students_data:
-        if data['progress']['evaluation'] and data.get('reflection'):
-            reflection_found = True
-            with st.expander(f"{data['name']} ({data['id']}) - {data['quiz_score']:.0f}점"):
-                st.write(data['reflection'])
-    
-    if not reflection_found:
+    if not reflections:
         st.info("아직 제출된 성찰 내용이 없습니다.")
+        return
+    
+    index = get_reflection_index()
+    themes = index.top_themes(15)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        if themes:
+            themes_df = pd.DataFrame(themes, columns=['키워드', 'TF-IDF', '학생 수'])
+            fig = px.bar(themes_df.iloc[::-1], x='TF-IDF', y='키워드', orientation='h',
+                         hover_data=['학생 수'], title="성찰 주요 키워드")
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        keywords = st.multiselect("키워드로 성찰 찾기", [theme[0] for theme in themes], key="reflection_keywords")
+        extra = st.text_input("직접 검색", key="reflection_search", placeholder="예: 클러스터링")
+        if extra.strip():
+            keywords = keywords + extra.split()
+        
+        matched_ids = index.search(keywords) if keywords else set(reflections)
+        matched = [reflections[student_id] for student_id in matched_ids if student_id in reflections]
+        st.caption(f"성찰 {len(matched)}/{len(reflections)}건")
+        
+        if matched:
+            st.dataframe(pd.DataFrame([{
+                '이름': data['name'],
+                '학번': data['id'],
+                '퀴즈점수': f"{data['quiz_score']:.0f}점",
+                '성찰내용': data['reflection']
+            } for data in sorted(matched, key=lambda data: data['id'])]), use_container_width=True, hide_index=True)
+        else:
+            st.info("해당 키워드가 포함된 성찰이 없습니다.")
 
 if __name__ == "__main__":
     main()
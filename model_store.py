@@ -0,0 +1,129 @@
+"""학습된 모델 저장소
+
+학습 데이터와 하이퍼파라미터의 해시를 키로 모델을 joblib 파일로 저장합니다.
+압축하지 않고 저장하므로 numpy 배열을 메모리 매핑(mmap_mode='r')으로 읽을 수 있고,
+같은 모델을 여는 여러 작업 프로세스가 운영체제 페이지 캐시를 공유합니다.
+
+scikit-learn의 결정 트리는 불러올 때(__setstate__) 노드 배열을 새 메모리로 복사하므로,
+랜덤 포레스트는 모든 트리의 노드를 이어 붙인 배열 묶음(pack_forest)으로 저장하고
+PackedForest가 매핑된 배열 위에서 바로 예측합니다.
+저장된 모델 파일은 MAX_MODELS개까지만 유지하고 가장 오래 쓰이지 않은 것부터 지웁니다.
+"""
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+
+MAX_MODELS = 256
+
+
+def model_key(arrays, params):
+    """데이터 배열과 파라미터로 만든 모델 키"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype, array.shape)).encode())
+        digest.update(array.tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def model_path(model_dir, kind, key):
+    return os.path.join(model_dir, f'{kind}_{key}.joblib')
+
+
+def load_model(model_dir, kind, key):
+    """저장된 모델을 메모리 매핑으로 열기 (없으면 None)"""
+    path = model_path(model_dir, kind, key)
+    try:
+        model = joblib.load(path, mmap_mode='r')
+        os.utime(path)  # 최근 사용 시각 기록 (오래 쓰이지 않은 모델부터 정리)
+    except FileNotFoundError:
+        return None
+    return PackedForest(model) if kind == 'classifier' else model
+
+
+def save_model(model_dir, kind, key, model, max_models=MAX_MODELS):
+    """모델 저장 (임시 파일에 쓴 뒤 교체하여 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 함)"""
+    os.makedirs(model_dir, exist_ok=True)
+    path = model_path(model_dir, kind, key)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    joblib.dump(pack_forest(model) if kind == 'classifier' else model, tmp_path)
+    os.replace(tmp_path, path)
+    prune_models(model_dir, max_models)
+    return path
+
+
+def prune_models(model_dir, max_models=MAX_MODELS):
+    """저장된 모델이 max_models개를 넘으면 가장 오래 쓰이지 않은 파일부터 삭제"""
+    entries = []
+    for entry in os.scandir(model_dir):
+        if entry.name.endswith('.joblib'):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+    if len(entries) <= max_models:
+        return 0
+
+    removed = 0
+    for _, path in sorted(entries)[:len(entries) - max_models]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            continue  # 다른 프로세스가 이미 지웠거나 (Windows에서) 매핑 중인 파일
+    return removed
+
+
+def pack_forest(model):
+    """RandomForestClassifier의 모든 트리 노드를 이어 붙인 배열 묶음"""
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    roots = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+
+    def children(name):
+        return np.concatenate([
+            np.where(getattr(tree, name) >= 0, getattr(tree, name) + root, -1)
+            for tree, root in zip(trees, roots)
+        ])
+
+    values = np.concatenate([tree.value[:, 0, :] for tree in trees])
+    return {
+        'classes': np.asarray(model.classes_),
+        'roots': roots,
+        'left': children('children_left'),
+        'right': children('children_right'),
+        'feature': np.concatenate([np.maximum(tree.feature, 0) for tree in trees]),
+        'threshold': np.concatenate([tree.threshold for tree in trees]),
+        'proba': values / values.sum(axis=1, keepdims=True)
+    }
+
+
+class PackedForest:
+    """pack_forest 배열로 예측하는 랜덤 포레스트 (배열은 메모리 매핑된 파일을 그대로 사용)"""
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.classes_ = arrays['classes']
+
+    def predict_proba(self, X):
+        """트리별 잎 노드의 클래스 비율 평균 (scikit-learn과 같이 float32로 비교)"""
+        arrays = self.arrays
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        node = np.tile(arrays['roots'], (len(X), 1))  # [샘플, 트리] 별 현재 노드
+
+        while True:
+            left = arrays['left'][node]
+            internal = left >= 0
+            if not internal.any():
+                break
+            go_left = X[rows, arrays['feature'][node]] <= arrays['threshold'][node]
+            node = np.where(internal, np.where(go_left, left, arrays['right'][node]), node)
+
+        return arrays['proba'][node].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,123 @@
+"""학생 성찰 내용 분석용 증분 키워드 인덱스
+
+성찰이 저장될 때마다 해당 문서의 토큰만 인덱스에 반영합니다.
+전체 말뭉치를 매번 다시 벡터화하지 않고, 누적된 단어 빈도와 문서 빈도로 TF-IDF 점수를 계산합니다.
+"""
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r'[가-힣]+|[a-zA-Z]+|[0-9]+')
+
+# 길이가 긴 것부터 검사해야 '에서'가 '서'보다 먼저 떨어짐
+KOREAN_SUFFIXES = sorted([
+    '했습니다', '였습니다', '습니다', '입니다', '했어요', '해요', '했다', '하다', '한다', '하는', '하고',
+    '해서', '했고', '되었다', '됐다', '되는', '되고', '에서는', '에서', '으로', '에게', '까지', '부터',
+    '처럼', '보다', '이라', '라고', '이다', '이었다', '었다', '았다', '였다', '한다는', '다는', '는다', '는지', '마다', '하게', '어서',
+    '은', '는', '이', '가', '을', '를', '에', '의', '도', '로', '와', '과', '고', '다', '요', '게', '할', '었', '았'
+], key=len, reverse=True)
+
+STOPWORDS = {
+    '것', '수', '등', '더', '잘', '좀', '정말', '너무', '많이', '그리고', '하지만', '그래서', '오늘',
+    '나', '저', '내', '제', '우리', '이번', '같', '있', '없', '하', '되', '알', '때', '어떻', '어떻게',
+    'the', 'a', 'an', 'and', 'to', 'of'
+}
+
+# 문서가 이만큼 모였을 때부터, 이 비율 이상의 문서에 나오는 단어는 주제로 보지 않음
+MIN_DOCS_FOR_MAX_DF = 10
+MAX_DOC_RATIO = 0.6
+
+
+def tokenize(text):
+    """한국어 조사/어미를 간단히 떼어낸 키워드 목록
+
+    '것이' -> '것'처럼 한 글자 어간도 떼어낸 뒤 불용어와 길이를 검사합니다.
+    """
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        if '가' <= word[0] <= '힣':
+            for suffix in KOREAN_SUFFIXES:
+                if len(word) > len(suffix) and word.endswith(suffix):
+                    word = word[:-len(suffix)]
+                    break
+        if len(word) > 1 and word not in STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+class ReflectionIndex:
+    """학생별 성찰 문서의 역색인과 TF-IDF 통계"""
+
+    def __init__(self):
+        self.documents = {}                  # {학번: 원문}
+        self.term_counts = {}                # {학번: Counter(토큰)}
+        self.doc_freq = Counter()            # 토큰이 등장한 문서 수
+        self.tf_sum = Counter()              # 문서 길이로 나눈 토큰 빈도의 합
+        self.postings = defaultdict(set)     # {토큰: {학번, ...}}
+        self._lock = threading.Lock()
+
+    def update(self, student_id, text):
+        """학생의 성찰 문서 추가/교체 (내용이 바뀐 경우에만 해당 문서만 다시 색인)"""
+        with self._lock:
+            if self.documents.get(student_id) == text:
+                return False
+
+            self._remove(student_id)
+            if text:
+                tokens = tokenize(text)
+                counts = Counter(tokens)
+                self.documents[student_id] = text
+                self.term_counts[student_id] = counts
+                for term, count in counts.items():
+                    self.doc_freq[term] += 1
+                    self.tf_sum[term] += count / len(tokens)
+                    self.postings[term].add(student_id)
+            return True
+
+    def _remove(self, student_id):
+        counts = self.term_counts.pop(student_id, None)
+        self.documents.pop(student_id, None)
+        if not counts:
+            return
+
+        n_tokens = sum(counts.values())
+        for term, count in counts.items():
+            self.doc_freq[term] -= 1
+            self.tf_sum[term] -= count / n_tokens
+            self.postings[term].discard(student_id)
+            if self.doc_freq[term] <= 0:
+                del self.doc_freq[term]
+                del self.tf_sum[term]
+                del self.postings[term]
+
+    def top_themes(self, k=15):
+        """문서별 TF-IDF 합계가 큰 키워드 [(키워드, 점수, 문서 수), ...]
+
+        단어 빈도는 문서 길이로 나누어 긴 성찰이 점수를 독차지하지 않게 하고,
+        대부분의 문서에 나오는 단어는 제외합니다.
+        """
+        with self._lock:
+            n_docs = len(self.documents)
+            max_df = n_docs * MAX_DOC_RATIO if n_docs >= MIN_DOCS_FOR_MAX_DF else n_docs
+            scored = (
+                (term, tf * (math.log((1 + n_docs) / (1 + self.doc_freq[term])) + 1), self.doc_freq[term])
+                for term, tf in self.tf_sum.items()
+                if self.doc_freq[term] <= max_df
+            )
+            return heapq.nlargest(k, scored, key=lambda item: item[1])
+
+    def search(self, keywords):
+        """모든 키워드를 포함한 학생 학번 집합"""
+        terms = [term for keyword in keywords for term in (tokenize(keyword) or [keyword.lower()])]
+        with self._lock:
+            if not terms:
+                return set(self.documents)
+            result = set(self.postings.get(terms[0], ()))
+            for term in terms[1:]:
+                result &= self.postings.get(term, set())
+            return result
+
+    def __len__(self):
+        return len(self.documents)
@@ -0,0 +1,295 @@
+"""가상 학급 트래픽 재생기 (교사 대시보드 용량 측정)
+
+가상 학생들이 정해진 속도로 접속해 단계 진입/완료, 퀴즈 응답, 성찰 제출을 하도록
+이벤트 기록을 만들고, 앱과 같은 함수(build_student_record, store_student_data,
+record_quiz_submission)로 학생 기록과 문항 분석에 직접 넣습니다.
+재생하는 동안 별도 스레드에서 교사 대시보드를 주기적으로 그려 렌더링 시간과 저장 지연을 측정하고
+용량 보고서를 출력합니다.
+
+사용법:
+    python replay_traffic.py --students 2000 --rate 200 --lesson-seconds 20
+    python replay_traffic.py --students 5000 --rate 500 --report capacity.json
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+SURNAMES = list('김이박최정강조윤장임한오서신권황안송류홍')
+GIVEN_SYLLABLES = list('민서준우지현예은도윤하진수아태건유나영재호성혜')
+
+REFLECTION_PHRASES = [
+    '지도학습은 정답이 있는 데이터로 학습한다는 것을 알게 되었다',
+    '클러스터링으로 고객 그룹을 나누는 것이 신기했다',
+    '인공지능 모델의 정확도가 데이터에 따라 달라지는 것이 흥미로웠다',
+    '비지도학습과 지도학습의 차이를 이해했다',
+    '회귀 직선이 점을 추가할 때마다 바뀌는 것이 재미있었다',
+    '이상 거래 탐지가 실생활에 어떻게 쓰이는지 궁금해졌다',
+    '하이퍼파라미터를 바꾸면 결과가 달라져서 놀라웠다',
+    '데이터가 많을수록 예측이 정확해진다는 것을 느꼈다'
+]
+
+# 수업 시간 중 각 단계가 차지하는 평균 비율 (지도학습, 비지도학습, 형성평가)
+STAGE_FRACTIONS = np.array([0.4, 0.35, 0.25])
+
+
+# bare 모드에서 렌더링할 때마다 경고를 남기는 Streamlit 로거
+BARE_MODE_LOGGERS = [
+    'streamlit',  # '브라우저에서 보려면 streamlit run을 사용하세요' 안내
+    'streamlit.runtime.scriptrunner_utils.script_run_context',
+    'streamlit.runtime.state.session_state_proxy',
+    'streamlit.runtime.caching.cache_data_api',
+    'streamlit.deprecation_util'
+]
+
+
+def hide_bare_mode_warnings():
+    """missing ScriptRunContext 같은 bare 모드 경고가 보고서를 가리지 않도록 오류만 출력
+
+    Streamlit은 설정을 읽을 때 로그 수준을 다시 정하므로 수준 대신 로거에 필터를 붙입니다.
+    """
+    for name in BARE_MODE_LOGGERS:
+        logging.getLogger(name).addFilter(lambda record: record.levelno >= logging.ERROR)
+
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q) * 1000) if len(values) else 0.0
+
+
+def generate_traces(n_students, rate, lesson_seconds, dropout, questions, rng):
+    """가상 학생 명단과 시간순 이벤트 목록 [(시각, 학생 번호, 이벤트, 값)]"""
+    students = [{
+        'name': rng.choice(SURNAMES) + ''.join(rng.choice(GIVEN_SYLLABLES, 2)),
+        'id': f'{20000 + i:05d}'
+    } for i in range(n_students)]
+
+    # 접속 시각과 단계별 소요 시간 (학생마다 다르게)
+    arrival = np.arange(n_students) / rate + rng.uniform(0, 1 / rate, n_students)
+    durations = rng.gamma(4.0, lesson_seconds * STAGE_FRACTIONS / 4, size=(n_students, 3))
+    finish = arrival[:, None] + np.cumsum(durations, axis=1)
+    stops_at = np.where(rng.random(n_students) < dropout, rng.integers(0, 3, n_students), 3)
+
+    # 학생 실력에 따라 정답 확률이 달라지도록 함
+    ability = rng.normal(0, 1, n_students)
+    difficulty = rng.normal(0, 0.7, len(questions))
+    p_correct = 1 / (1 + np.exp(-(ability[:, None] - difficulty[None, :] + 0.5)))
+    correct = rng.random((n_students, len(questions))) < p_correct
+
+    stages = ['supervised', 'unsupervised', 'evaluation']
+    events = []
+    for i in range(n_students):
+        events.append((arrival[i], i, 'join', None))
+        start = arrival[i]
+        for s, stage in enumerate(stages[:stops_at[i]]):
+            events.append((start, i, 'enter', stage))
+            if stage == 'evaluation':
+                answer_times = np.sort(rng.uniform(start, finish[i, s], len(questions)))
+                for q, question in enumerate(questions):
+                    if correct[i, q]:
+                        option = question['correct']
+                    else:
+                        option = rng.choice([j for j in range(len(question['options'])) if j != question['correct']])
+                    events.append((answer_times[q], i, 'answer', (q, int(option))))
+                reflection = ' '.join(rng.choice(REFLECTION_PHRASES, rng.integers(1, 4), replace=False))
+                events.append((finish[i, s], i, 'submit', reflection))
+            else:
+                events.append((finish[i, s], i, 'complete', stage))
+            start = finish[i, s]
+
+    events.sort(key=lambda event: event[0])
+    return students, events
+
+
+class DashboardProbe(threading.Thread):
+    """재생 중 교사 대시보드를 주기적으로 그려 렌더링 시간 측정"""
+
+    def __init__(self, app, interval):
+        super().__init__(name='dashboard-probe', daemon=True)
+        self.app = app
+        self.interval = interval
+        self.samples = []  # (학생 수, 렌더링 초)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.render_once()
+
+    def render_once(self):
+        roster = len(self.app.get_student_store())
+        start = time.perf_counter()
+        self.app.show_teacher_dashboard()
+        self.samples.append((roster, time.perf_counter() - start))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def replay(app, students, events, questions):
+    """이벤트를 예정된 시각에 맞추어 저장 경로에 넣고 저장 지연 측정"""
+    state = [{
+        'progress': {'supervised': False, 'unsupervised': False, 'evaluation': False},
+        'quiz_answers': {},
+        'reflection': ''
+    } for _ in students]
+    store_latency = []
+    max_lag = 0.0
+
+    def save(i):
+        record = app.build_student_record(students[i], state[i]['progress'], state[i]['quiz_answers'],
+                                          state[i]['reflection'])
+        start = time.perf_counter()
+        app.store_student_data(record)
+        store_latency.append(time.perf_counter() - start)
+
+    activity_log = app.get_activity_log()
+    started = time.perf_counter()
+
+    for at, i, kind, value in events:
+        delay = at - (time.perf_counter() - started)
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            max_lag = max(max_lag, -delay)
+
+        student_id = students[i]['id']
+        if kind == 'join':
+            save(i)
+        elif kind == 'enter':
+            activity_log.append(app.STAGE_ENTERED, student_id, value)
+        elif kind == 'complete':
+            state[i]['progress'][value] = True
+            activity_log.append(app.STAGE_COMPLETED, student_id, value)
+            save(i)
+        elif kind == 'answer':
+            q, option = value
+            question = questions[q]
+            state[i]['quiz_answers'][question['id']] = app.make_quiz_answer(question, question['options'][option])
+            activity_log.append(app.QUIZ_ANSWERED, student_id, 'evaluation', question=question['id'], option=option)
+        elif kind == 'submit':
+            state[i]['reflection'] = value
+            state[i]['progress']['evaluation'] = True
+            activity_log.append(app.SUBMITTED, student_id, 'evaluation',
+                                score=app.calculate_quiz_score(state[i]['quiz_answers']))
+            activity_log.append(app.STAGE_COMPLETED, student_id, 'evaluation')
+            save(i)
+            app.record_quiz_submission(student_id, state[i]['quiz_answers'])
+
+    return store_latency, max_lag, time.perf_counter() - started
+
+
+def build_report(args, n_events, elapsed, store_latency, max_lag, samples):
+    render_times = [seconds for _, seconds in samples]
+    over_budget = [roster for roster, seconds in samples if seconds * 1000 > args.render_budget_ms]
+
+    # 학생 수 구간별 렌더링 시간
+    buckets = []
+    if samples:
+        edges = np.unique(np.linspace(0, max(roster for roster, _ in samples), 6).astype(int))
+        for low, high in zip(edges[:-1], edges[1:]):
+            bucket = [seconds for roster, seconds in samples if low < roster <= high]
+            if bucket:
+                buckets.append({
+                    'roster': f'{low + 1}-{high}',
+                    'renders': len(bucket),
+                    'p50_ms': percentile_ms(bucket, 50),
+                    'max_ms': max(bucket) * 1000
+                })
+
+    return {
+        'students': args.students,
+        'arrival_rate': args.rate,
+        'events': n_events,
+        'elapsed_seconds': elapsed,
+        'events_per_second': n_events / elapsed if elapsed else 0,
+        'max_replay_lag_seconds': max_lag,
+        'store_latency_ms': {
+            'calls': len(store_latency),
+            'p50': percentile_ms(store_latency, 50),
+            'p95': percentile_ms(store_latency, 95),
+            'p99': percentile_ms(store_latency, 99),
+            'max': max(store_latency) * 1000 if store_latency else 0.0
+        },
+        'dashboard_render_ms': {
+            'renders': len(render_times),
+            'p50': percentile_ms(render_times, 50),
+            'p95': percentile_ms(render_times, 95),
+            'max': max(render_times) * 1000 if render_times else 0.0,
+            'by_roster': buckets
+        },
+        'render_budget_ms': args.render_budget_ms,
+        'first_roster_over_budget': min(over_budget) if over_budget else None
+    }
+
+
+def print_report(report):
+    store = report['store_latency_ms']
+    render = report['dashboard_render_ms']
+    print()
+    print('=== 용량 보고서 ===')
+    print(f"학생 {report['students']:,}명 · 접속 속도 {report['arrival_rate']:g}명/초 · 이벤트 {report['events']:,}건")
+    print(f"재생 시간 {report['elapsed_seconds']:.1f}초 · 처리 속도 {report['events_per_second']:,.0f}건/초 · "
+          f"최대 지연 {report['max_replay_lag_seconds']:.2f}초")
+    print(f"저장 지연(ms)  p50 {store['p50']:.3f} · p95 {store['p95']:.3f} · p99 {store['p99']:.3f} · "
+          f"최대 {store['max']:.3f} ({store['calls']:,}회)")
+    print(f"대시보드(ms)  p50 {render['p50']:.1f} · p95 {render['p95']:.1f} · 최대 {render['max']:.1f} "
+          f"({render['renders']}회)")
+    for bucket in render['by_roster']:
+        print(f"  학생 {bucket['roster']:>12}명: p50 {bucket['p50_ms']:8.1f} · 최대 {bucket['max_ms']:8.1f} "
+              f"({bucket['renders']}회)")
+    if report['first_roster_over_budget'] is None:
+        print(f"대시보드 렌더링이 기준({report['render_budget_ms']:g}ms)을 넘지 않았습니다.")
+    else:
+        print(f"⚠️ 학생 {report['first_roster_over_budget']:,}명에서 대시보드 렌더링이 "
+              f"기준({report['render_budget_ms']:g}ms)을 넘었습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가상 학급 트래픽으로 교사 대시보드와 학생 저장소 용량 측정')
+    parser.add_argument('--students', type=int, default=1000, help='가상 학생 수')
+    parser.add_argument('--rate', type=float, default=200, help='초당 접속하는 학생 수')
+    parser.add_argument('--lesson-seconds', type=float, default=20, help='한 학생이 전체 단계를 마치는 평균 시간(초)')
+    parser.add_argument('--dropout', type=float, default=0.1, help='중간에 그만두는 학생 비율')
+    parser.add_argument('--render-interval', type=float, default=1.0, help='대시보드 렌더링 측정 주기(초)')
+    parser.add_argument('--render-budget-ms', type=float, default=1000, help='대시보드 렌더링 허용 시간(ms)')
+    parser.add_argument('--data-dir', help='저장소/로그 폴더 (기본: 임시 폴더)')
+    parser.add_argument('--report', help='보고서를 저장할 JSON 파일')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # 실제 수업 데이터와 섞이지 않도록 별도 폴더 사용
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    hide_bare_mode_warnings()
+    import main as app
+    app.DATA_DIR = args.data_dir or tempfile.mkdtemp(prefix='replay_')
+    app.st.session_state.is_teacher = True
+
+    rng = np.random.default_rng(args.seed)
+    students, events = generate_traces(args.students, args.rate, args.lesson_seconds, args.dropout,
+                                       app.QUIZ_QUESTIONS, rng)
+    print(f"가상 학생 {len(students):,}명, 이벤트 {len(events):,}건 재생 시작 (데이터 폴더: {app.DATA_DIR})")
+
+    probe = DashboardProbe(app, args.render_interval)
+    probe.start()
+    store_latency, max_lag, elapsed = replay(app, students, events, app.QUIZ_QUESTIONS)
+    probe.stop()
+    probe.render_once()  # 모든 학생이 들어온 뒤의 최종 렌더링
+
+    app.get_activity_log().flush()
+    report = build_report(args, len(events), elapsed, store_latency, max_lag, probe.samples)
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"보고서 저장: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""학생 데이터 저장소
+
+모든 세션이 공유하는 학생 기록 저장소입니다.
+- 마지막 활동 시각은 단조 시계(time.monotonic) 기준으로 관리
+- 일정 시간 활동이 없는 기록은 메모리에서 내보내고 디스크에 보관(archive)
+- 마지막 활동 시각 기준 힙을 사용하여 만료된 기록만 꺼내므로 전체 학생을 훑지 않음
+- 기록은 최근 활동 순서로 보관하고, version은 명단이나 index_fields 값이 바뀔 때만 증가
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class StudentStore:
+    """TTL 기반으로 오래된 기록을 내보내는 학생 데이터 저장소
+
+    - archive_dir: 내보낸 기록을 저장할 폴더 (날짜별 JSON Lines)
+    - idle_ttl: 이 시간(초) 동안 활동이 없으면 메모리에서 내보냄
+    - retention_days: 보관 파일을 유지하는 기간(일)
+    - sweep_interval: 백그라운드 정리 주기(초)
+    - index_fields: 값이 바뀌면 version을 올리는 필드 (정렬/검색 인덱스가 다시 만들어짐)
+    """
+
+    def __init__(self, archive_dir, idle_ttl=6 * 60 * 60, retention_days=180, sweep_interval=60,
+                 index_fields=('name', 'progress', 'quiz_score')):
+        self.archive_dir = archive_dir
+        self.index_fields = index_fields
+        self.idle_ttl = idle_ttl
+        self.retention_days = retention_days
+        self.sweep_interval = sweep_interval
+        self.version = 0
+        self.on_evict = []
+        self._records = {}
+        self._last_active = {}
+        self._heap = []          # (마지막 활동 시각, 학번) - 갱신 시 새 항목을 넣고 옛 항목은 꺼낼 때 무시
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper = None
+
+    def upsert(self, record):
+        """학생 기록 추가/갱신 (updated_at은 표시용 유닉스 시간)"""
+        now = time.monotonic()
+        record = dict(record, updated_at=time.time())
+
+        with self._lock:
+            # 다시 넣어 dict 순서를 최근 활동 순서로 유지
+            previous = self._records.pop(record['id'], None)
+            self._records[record['id']] = record
+            self._last_active[record['id']] = now
+            heapq.heappush(self._heap, (now, record['id']))
+            if previous is None or any(previous.get(field) != record.get(field) for field in self.index_fields):
+                self.version += 1
+        return record
+
+    def get(self, student_id):
+        with self._lock:
+            return self._records.get(student_id)
+
+    def all(self):
+        with self._lock:
+            return list(self._records.values())
+
+    def recent_ids(self):
+        """활동이 오래된 학생부터 최근 학생 순서의 학번 목록"""
+        with self._lock:
+            return list(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def sweep(self, now=None):
+        """idle_ttl이 지난 기록을 내보내고 보관 (만료된 항목 수에 비례하는 시간)"""
+        now = time.monotonic() if now is None else now
+        deadline = now - self.idle_ttl
+        evicted = []
+
+        with self._lock:
+            while self._heap and self._heap[0][0] < deadline:
+                last_active, student_id = heapq.heappop(self._heap)
+                if self._last_active.get(student_id) != last_active:
+                    continue  # 이후에 다시 활동한 학생의 옛 항목
+                evicted.append(self._records.pop(student_id))
+                del self._last_active[student_id]
+
+            # 갱신이 잦으면 옛 항목이 쌓이므로 살아 있는 기록의 몇 배가 되면 힙을 다시 만듦
+            if len(self._heap) > 4 * len(self._records) + 64:
+                self._heap = [(last_active, student_id) for student_id, last_active in self._last_active.items()]
+                heapq.heapify(self._heap)
+
+            if evicted:
+                self.version += 1
+
+        if evicted:
+            self._archive(evicted)
+            # 내보낸 직후 다시 저장된 학생은 인덱스에 새 데이터가 있으므로 지우지 않음
+            # (확인과 콜백 사이에 다시 저장되지 않도록 잠금 안에서 실행, 저장하는 쪽은 upsert 후에 인덱스를 갱신)
+            with self._lock:
+                for record in evicted:
+                    if record['id'] in self._records:
+                        continue
+                    for callback in self.on_evict:
+                        callback(record)
+        return evicted
+
+    def _archive(self, records):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"students_{datetime.now().strftime('%Y%m%d')}.jsonl")
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def purge_archives(self):
+        """보관 기간이 지난 보관 파일 삭제"""
+        if not os.path.isdir(self.archive_dir):
+            return
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime('%Y%m%d')
+        for name in os.listdir(self.archive_dir):
+            if name.startswith('students_') and name[len('students_'):-len('.jsonl')] < cutoff:
+                os.remove(os.path.join(self.archive_dir, name))
+
+    def start_sweeper(self):
+        """sweep_interval마다 sweep을 실행하는 백그라운드 스레드 시작"""
+        if self._sweeper is not None:
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, name='student-store-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop.set()
+
+    def _sweep_loop(self):
+        last_purge = None  # 첫 정리 때 바로 보관 파일도 정리
+        while not self._stop.wait(self.sweep_interval):
+            self.sweep()
+            if last_purge is None or time.monotonic() - last_purge > 24 * 60 * 60:
+                self.purge_archives()
+                last_purge = time.monotonic()
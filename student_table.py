@@ -0,0 +1,84 @@
+"""교사 대시보드용 학생 목록 인덱스
+
+정렬 순서와 이름/학번 접두어 인덱스를 명단이나 정렬/검색에 쓰는 값이 바뀔 때 한 번만 만들어 두고,
+화면에 보이는 한 페이지의 행만 꺼내서 표로 만듭니다.
+행 내용은 저장소에서 최신 기록을 읽고, 최근접속 순서는 저장소가 유지하는 활동 순서를 그대로 사용합니다.
+"""
+from bisect import bisect_left
+
+import numpy as np
+
+# 정렬 가능한 열: {표시 이름: 정렬 키 함수}
+SORT_KEYS = {
+    '학번': lambda data: data['id'],
+    '이름': lambda data: data['name'],
+    '진도': lambda data: sum(data['progress'].values()),
+    '퀴즈점수': lambda data: data['quiz_score']
+}
+
+# 저장소의 활동 순서로 정렬하는 열 (갱신될 때마다 바뀌므로 미리 정렬하지 않음)
+RECENT_SORT = '최근접속'
+SORT_COLUMNS = [*SORT_KEYS, RECENT_SORT]
+
+
+class StudentTable:
+    """학생 목록의 정렬 순서와 접두어 검색 인덱스"""
+
+    def __init__(self, store):
+        self.store = store
+        self.records = store.all()
+        self.ids = [data['id'] for data in self.records]
+        self.positions = {student_id: i for i, student_id in enumerate(self.ids)}
+
+        # 열별 정렬 순서(오름차순 레코드 번호)와 각 레코드의 순위
+        self.orders = {}
+        self.ranks = {}
+        for column, key in SORT_KEYS.items():
+            order = np.array(sorted(range(len(self.records)), key=lambda i: key(self.records[i])), dtype=np.int64)
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            self.orders[column] = order
+            self.ranks[column] = rank
+
+        # (검색 키, 레코드 번호)를 정렬해 두고 이분 탐색으로 접두어 범위를 찾음
+        self.prefix_keys = sorted(
+            [(data['name'].lower(), i) for i, data in enumerate(self.records)]
+            + [(data['id'].lower(), i) for i, data in enumerate(self.records)]
+        )
+        self._search_keys = [key for key, _ in self.prefix_keys]
+
+    def search(self, prefix):
+        """이름 또는 학번이 prefix로 시작하는 레코드 번호 배열"""
+        prefix = prefix.strip().lower()
+        start = bisect_left(self._search_keys, prefix)
+        end = bisect_left(self._search_keys, prefix + '\uffff', lo=start)
+        return np.unique(np.array([i for _, i in self.prefix_keys[start:end]], dtype=np.int64))
+
+    def count(self, prefix=''):
+        """검색 결과 수"""
+        return len(self.search(prefix)) if prefix.strip() else len(self.records)
+
+    def page(self, prefix='', sort_by='학번', descending=False, page=0, page_size=20):
+        """한 페이지 분량의 레코드(최신 값)와 전체 결과 수"""
+        if sort_by == RECENT_SORT:
+            order = np.array([self.positions[student_id] for student_id in self.store.recent_ids()
+                              if student_id in self.positions], dtype=np.int64)
+            if prefix.strip():
+                order = order[np.isin(order, self.search(prefix))]
+        elif prefix.strip():
+            matched = self.search(prefix)
+            # 검색 결과만 미리 계산된 순위로 정렬
+            order = matched[np.argsort(self.ranks[sort_by][matched], kind='stable')]
+        else:
+            order = self.orders[sort_by]
+
+        total = len(order)
+        if descending:
+            order = order[::-1]
+
+        start = page * page_size
+        rows = [self.store.get(self.ids[i]) or self.records[i] for i in order[start:start + page_size]]
+        return rows, total
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,265 @@
+"""AI 모델 학습 작업 서비스
+
+Streamlit 스크립트 스레드를 막지 않도록 모델 학습을 별도 프로세스 풀에서 실행합니다.
+버튼 클릭은 작업을 제출만 하고, 페이지는 작업 상태를 주기적으로 확인합니다.
+(프로세스 풀에서 실행할 함수는 pickle 가능해야 하므로 main.py 밖의 모듈에 둡니다.)
+"""
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ShuffleSplit, cross_val_score, learning_curve, train_test_split
+
+from model_store import load_model, model_key, save_model
+
+
+class TrainingQueueFull(Exception):
+    """대기 중인 학습 작업이 너무 많을 때 발생"""
+
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+def train_classifier(X, y, params):
+    """랜덤 포레스트 학습 후 정확도 반환 (작업 프로세스에서 실행)
+
+    params['model_dir']가 있으면 같은 데이터/파라미터로 학습된 모델을 디스크에서 다시 사용합니다.
+    """
+    start = time.time()
+    test_size = params.get('test_size', 0.3)
+    random_state = params.get('random_state', 42)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y,
+        test_size=test_size,
+        random_state=random_state
+    )
+
+    model_params = {
+        'n_estimators': params.get('n_estimators', 100),
+        'max_depth': params.get('max_depth'),
+        'random_state': random_state
+    }
+    model_dir = params.get('model_dir')
+    key = model_key([X, y], dict(model_params, test_size=test_size))
+    model = load_model(model_dir, 'classifier', key) if model_dir else None
+    cached = model is not None
+
+    if model is None:
+        model = RandomForestClassifier(**model_params)
+        model.fit(X_train, y_train)
+        if model_dir:
+            save_model(model_dir, 'classifier', key, model)
+
+    y_pred = model.predict(X_test)
+    return {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'train_seconds': time.time() - start,
+        'model_key': key if model_dir else None,
+        'cached': cached
+    }
+
+
+def cross_validate_config(X, y, n_estimators, max_depth, test_size, n_splits=5):
+    """하이퍼파라미터 조합 하나의 교차검증 정확도 (평균, 표준편차)"""
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=42)
+    cv = ShuffleSplit(n_splits=n_splits, test_size=test_size, random_state=42)
+    scores = cross_val_score(model, X, y, cv=cv, scoring='accuracy')
+    return {
+        'n_estimators': n_estimators,
+        'max_depth': max_depth,
+        'test_size': test_size,
+        'cv_mean': scores.mean(),
+        'cv_std': scores.std()
+    }
+
+
+def compute_learning_curve(X, y, n_estimators, max_depth, test_size, n_splits=5, n_jobs=None):
+    """학습 데이터 크기에 따른 학습/검증 정확도 곡선"""
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=42)
+    cv = ShuffleSplit(n_splits=n_splits, test_size=test_size, random_state=42)
+    sizes, train_scores, test_scores = learning_curve(
+        model, X, y, cv=cv, train_sizes=[0.2, 0.4, 0.6, 0.8, 1.0],
+        scoring='accuracy', n_jobs=n_jobs
+    )
+    return {
+        'train_sizes': sizes,
+        'train_mean': train_scores.mean(axis=1),
+        'test_mean': test_scores.mean(axis=1),
+        'test_std': test_scores.std(axis=1)
+    }
+
+
+class TrainingJobService:
+    """크기가 제한된 프로세스 풀 위에서 동작하는 학습 작업 관리자
+
+    - max_workers: 동시에 학습할 수 있는 작업 수
+    - max_queue: 완료되지 않은 작업(대기 + 실행)의 최대 개수
+    - stale_after: 이 시간(초)이 지나도록 시작하지 못한 작업은 취소
+    - keep_results: 완료된 작업 결과를 보관하는 시간(초)
+
+    프로세스 풀은 작업자 수보다 한 개 더 많은 작업을 미리 가져가 취소할 수 없게 만들기 때문에,
+    대기 작업은 서비스가 직접 보관하고 빈 작업자가 있을 때만 풀에 넘깁니다.
+    따라서 풀에 넘겨진 작업이 곧 실제로 실행 중인 작업입니다.
+    """
+
+    def __init__(self, max_workers=2, max_queue=16, stale_after=120, keep_results=600):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.stale_after = stale_after
+        self.keep_results = keep_results
+        self._executor = self._new_executor()
+        self._jobs = {}
+        self._owner_jobs = {}
+        self._pending = deque()  # 대기 중인 작업 ID (제출 순서)
+        self._running = set()
+        self._lock = threading.RLock()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def _restart_executor(self, broken):
+        """작업 프로세스가 비정상 종료되어 깨진 풀을 새 풀로 교체 (이미 교체했으면 무시)"""
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+
+    def submit(self, owner, X, y, params=None):
+        """학습 작업 제출 후 작업 ID 반환
+
+        같은 사용자가 이전에 제출한 작업이 아직 대기 중이면 취소하고 새 작업으로 바꿉니다.
+        """
+        self.cancel_stale()
+
+        with self._lock:
+            previous = self._owner_jobs.get(owner)
+            if previous in self._jobs:
+                self.cancel(previous)
+
+            pending = len(self._pending) + len(self._running)
+            if pending >= self.max_queue:
+                raise TrainingQueueFull(f"대기 중인 학습 작업이 {pending}개입니다. 잠시 후 다시 시도하세요.")
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'owner': owner,
+                'args': (X, y, params or {}),
+                'state': QUEUED,
+                'future': None,
+                'submitted_at': time.monotonic(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self._owner_jobs[owner] = job_id
+            self._pending.append(job_id)
+            self._dispatch()
+
+        return job_id
+
+    def _dispatch(self):
+        """빈 작업자 수만큼 대기 작업을 프로세스 풀에 넘김"""
+        with self._lock:
+            while self._pending and len(self._running) < self.max_workers:
+                job_id = self._pending.popleft()
+                job = self._jobs[job_id]
+                try:
+                    future = self._executor.submit(train_classifier, *job['args'])
+                except BrokenProcessPool:
+                    self._restart_executor(self._executor)
+                    future = self._executor.submit(train_classifier, *job['args'])
+                del job['args']
+                job['state'] = RUNNING
+                job['started_at'] = time.monotonic()
+                job['executor'] = self._executor
+                job['future'] = future
+                self._running.add(job_id)
+                job['future'].add_done_callback(lambda _f, job_id=job_id: self._mark_finished(job_id))
+
+    def _mark_finished(self, job_id):
+        with self._lock:
+            job = self._jobs[job_id]
+            error = job['future'].exception()
+            if isinstance(error, BrokenProcessPool):
+                # 작업 프로세스가 죽으면(메모리 부족 등) 풀 전체가 깨지므로 새 풀을 만들어 다음 작업을 계속 처리
+                self._restart_executor(job['executor'])
+                job['error'] = "학습 프로세스가 비정상 종료되었습니다. (메모리 부족 등) 다시 시도해주세요."
+            elif error is not None:
+                job['error'] = str(error)
+            job['state'] = FAILED if error is not None else DONE
+            job['finished_at'] = time.monotonic()
+            self._running.discard(job_id)
+            self._dispatch()
+
+    def status(self, job_id):
+        """작업 상태 조회
+
+        반환값: {'state', 'queue_position', 'elapsed', 'result', 'error'}
+        """
+        self.cancel_stale()
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            info = {
+                'state': job['state'],
+                'queue_position': 0,
+                'elapsed': time.monotonic() - (job['started_at'] or job['submitted_at']),
+                'result': None,
+                'error': None
+            }
+
+            if job['state'] == QUEUED:
+                info['queue_position'] = self._pending.index(job_id) + 1
+            elif job['state'] == FAILED:
+                info['error'] = job['error']
+            elif job['state'] == DONE:
+                info['result'] = job['future'].result()
+
+        return info
+
+    def cancel(self, job_id):
+        """대기 중인 작업 취소 (이미 실행 중인 작업은 취소할 수 없음)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['state'] != QUEUED:
+                return False
+            self._pending.remove(job_id)
+            job.pop('args', None)
+            job['state'] = CANCELLED
+            job['finished_at'] = time.monotonic()
+            return True
+
+    def cancel_stale(self):
+        """오래 대기한 작업을 취소하고 보관 기간이 지난 결과를 정리"""
+        now = time.monotonic()
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job['state'] == QUEUED:
+                    if now - job['submitted_at'] > self.stale_after:
+                        self.cancel(job_id)
+                elif job['finished_at'] is not None and now - job['finished_at'] > self.keep_results:
+                    del self._jobs[job_id]
+                    if self._owner_jobs.get(job['owner']) == job_id:
+                        del self._owner_jobs[job['owner']]
+
+    def stats(self):
+        """대기/실행 중인 작업 수"""
+        self.cancel_stale()
+        with self._lock:
+            return {'running': len(self._running), 'queued': len(self._pending), 'max_workers': self.max_workers}